@@ -1,3 +1,5 @@
+import hashlib
+from datetime import UTC, datetime
 from typing import Annotated, Any
 
 import structlog
@@ -11,17 +13,30 @@ from sqlalchemy.exc import NoResultFound
 from sqlmodel import select
 
 from app.auth.oidc import TokenPayload
+from app.core.cache import TTLCache
 from app.core.config import settings
 from app.core.deps import DatabaseDep, oidc_provider
 from app.models import Message
 from app.models.user import User
 
-default_responses: dict[int | str, dict[str, Any]] = {404: {"model": Message}}
-
 log = structlog.stdlib.get_logger("api")
 
 oidc_scheme = OpenIdConnect(openIdConnectUrl=str(settings.auth.oidc_url), auto_error=False)
 
+default_responses: dict[int | str, dict[str, Any]] = {404: {"model": Message}}
+
+
+def deleted_responses(detail: str) -> dict[int | str, dict[str, Any]]:
+    """OpenAPI responses of a delete route, `detail` is the example message of a successful delete"""
+    return {
+        **default_responses,
+        200: {"model": Message, "content": {"application/json": {"example": {"detail": detail}}}},
+    }
+
+
+# Validated access tokens, keyed by a hash of the token so the tokens themselves aren't kept in memory
+token_cache: TTLCache[bytes, TokenPayload] = TTLCache(maxsize=10_000, ttl=300)
+
 
 async def get_token_payload(authorization: Annotated[str, Depends(oidc_scheme)]) -> TokenPayload:
     try:
@@ -34,9 +49,15 @@ async def get_token_payload(authorization: Annotated[str, Depends(oidc_scheme)])
                 detail="Not authenticated",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        # Clients reuse the same token until it expires, don't verify the signature and validate it every time
+        cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        token_payload = token_cache.get(cache_key)
+        if token_payload is not None:
+            return token_payload
+
         payload = await oidc_provider.decode_token(token)
         log.debug("Validated access token", token=payload)
-        return TokenPayload.model_validate(payload)
+        token_payload = TokenPayload.model_validate(payload)
     except (InvalidTokenError, ValidationError) as exc:
         log.debug(f"Could not validate credentials: {exc}")
         raise HTTPException(
@@ -44,25 +65,49 @@ async def get_token_payload(authorization: Annotated[str, Depends(oidc_scheme)])
             detail=f"Could not validate credentials: {exc}",
         ) from exc
 
+    # Never cache a token past its expiry
+    ttl = min((token_payload.exp - datetime.now(UTC)).total_seconds(), token_cache.ttl)
+    if ttl > 0:
+        token_cache.set(cache_key, token_payload, ttl=ttl)
+    return token_payload
+
 
 TokenDep = Annotated[TokenPayload, Depends(get_token_payload)]
 """Get the validated access token payload for the request"""
 
 
+# Every API request resolves the user from the access token, cache them briefly to skip the query.
+# Users are also created and changed through /auth, any change is picked up once the entry expires.
+user_cache: TTLCache[str, User] = TTLCache(maxsize=10_000, ttl=60)
+
+
 async def get_current_user(db: DatabaseDep, token: TokenDep) -> User:
-    try:
-        result = await db.exec(select(User).where(User.email == token.email))
-        user = result.one()
-    except NoResultFound:
-        log.debug("User not found in DB, creating entry from the access token")
-        user_create = User(email=token.email, name=token.name, username=token.preferred_username)
-        db.add(user_create)
-        await db.commit()
-        await db.refresh(user_create)
-        log.debug("User created", user=user_create)
-        return User.model_validate(user_create)
-
-    log.debug("User found in DB", user=user)
+    if not token.email:
+        log.debug("Access token has no email claim")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Could not validate credentials: missing email claim",
+        )
+
+    cached = user_cache.get(token.email)
+    if cached is not None:
+        # The cached instance belongs to an earlier request, copy it into this request's db session without
+        # querying for it again
+        user = await db.merge(cached, load=False)
+    else:
+        try:
+            result = await db.exec(select(User).where(User.email == token.email))
+            user = result.one()
+            log.debug("User found in DB", user=user)
+        except NoResultFound:
+            log.debug("User not found in DB, creating entry from the access token")
+            user = User(email=token.email, name=token.name, username=token.preferred_username)
+            db.add(user)
+            await db.commit()
+            await db.refresh(user)
+            log.debug("User created", user=user)
+        user_cache.set(token.email, user)
+
     if isinstance(user.id, int):
         structlog.contextvars.bind_contextvars(user_id=user.id)
         current_span = trace.get_current_span()
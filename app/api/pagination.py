@@ -0,0 +1,145 @@
+import base64
+import binascii
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Annotated, Any, Literal, cast
+
+from fastapi import Depends, HTTPException, Query, status
+from pydantic import BaseModel, Field
+from pydantic_core import from_json, to_json
+from sqlalchemy import ColumnElement, DateTime, and_, false, inspect, or_
+from sqlalchemy.orm import InstrumentedAttribute, Mapped
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
+
+
+class CursorParams(BaseModel):
+    """Keyset (cursor) pagination parameters"""
+
+    cursor: str | None = None
+    size: int = 50
+
+
+async def get_cursor_params(
+    cursor: Annotated[
+        str | None, Query(description="The `next_cursor` of the previous page, omit for the first page.")
+    ] = None,
+    size: Annotated[int, Query(ge=1, le=100, description="Page size")] = 50,
+) -> CursorParams:
+    return CursorParams(cursor=cursor, size=size)
+
+
+CursorParamsDep = Annotated[CursorParams, Depends(get_cursor_params)]
+"""Get the keyset pagination parameters for the request"""
+
+
+class CursorPage[T](BaseModel):
+    """A page of results, fetch the following page by passing `next_cursor` as the `cursor` parameter."""
+
+    items: list[T]
+    next_cursor: str | None = Field(description="Cursor for the next page, null if this is the last page.")
+
+
+def _is_datetime(column: Mapped[Any]) -> bool:
+    # Check the type itself, python_type raises NotImplementedError for types like SQLModel's AutoString
+    return isinstance(cast(InstrumentedAttribute[Any], column).expression.type, DateTime)
+
+
+def _encode_cursor(values: Sequence[Any]) -> str:
+    return base64.urlsafe_b64encode(to_json(values)).decode("ascii")
+
+
+def _decode_cursor(cursor: str, keyset: Sequence[Mapped[Any]]) -> list[Any]:
+    try:
+        values = from_json(base64.urlsafe_b64decode(cursor))
+    except (binascii.Error, ValueError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+    if not isinstance(values, list) or len(values) != len(keyset):
+        # Cursor is from a different sort order (or has been tampered with)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    try:
+        return [
+            datetime.fromisoformat(value) if value is not None and _is_datetime(column) else value
+            for column, value in zip(keyset, values, strict=True)
+        ]
+    except (TypeError, ValueError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+
+def _keyset_value(row: Any, column: Mapped[Any]) -> Any:
+    attribute = cast(InstrumentedAttribute[Any], column)
+    owner = attribute.class_
+    if isinstance(owner, type) and isinstance(row, owner):
+        return getattr(row, attribute.key)
+
+    # Sorting on a column from a joined model (e.g. items by collection title), follow the relationship to it
+    for relationship in inspect(type(row)).relationships:
+        if relationship.mapper.class_ is owner:
+            related = getattr(row, relationship.key)
+            return None if related is None else getattr(related, attribute.key)
+
+    raise ValueError(f"{attribute} is not a column of {type(row).__name__} or any of its relationships")
+
+
+def _after(keyset: Sequence[Mapped[Any]], values: Sequence[Any], order: Literal["asc", "desc"]) -> ColumnElement[bool]:
+    """
+    Build the WHERE clause matching the rows that sort after `values`.
+
+    Postgres sorts NULLs as larger than any other value (last for asc, first for desc), so a NULL is
+    only followed by other NULLs (asc) or by every non-NULL value (desc).
+    """
+    clauses: list[ColumnElement[bool]] = []
+    equal: list[ColumnElement[bool]] = []
+    for column, value in zip(keyset, values, strict=True):
+        after: ColumnElement[bool]
+        if value is None:
+            after = column.is_not(None) if order == "desc" else false()
+            same = column.is_(None)
+        elif order == "desc":
+            after = column < value
+            same = column == value
+        else:
+            after = or_(column > value, column.is_(None))
+            same = column == value
+        clauses.append(and_(*equal, after))
+        equal.append(same)
+
+    first_column, first_value = keyset[0], values[0]
+    if order == "desc" and first_value is not None:
+        # Redundant with the clauses above, but gives the planner a range to start the index scan from
+        return and_(first_column <= first_value, or_(*clauses))
+    return or_(*clauses)
+
+
+async def apaginate_keyset[T](
+    session: AsyncSession,
+    statement: SelectOfScalar[Any],
+    page_type: type[CursorPage[T]],
+    keyset: Sequence[Mapped[Any]],
+    order: Literal["asc", "desc"],
+    params: CursorParams,
+) -> CursorPage[T]:
+    """
+    Paginate the statement using keyset pagination.
+
+    Rather than OFFSET (which reads and throws away every preceding row) and COUNT(*) (which reads the
+    whole table), each page filters on the sort values of the last row of the previous page. Every
+    page is a range scan of the sort index, no matter how deep into the results it is.
+
+    The `keyset` columns must uniquely identify a row, so they should end with the primary key.
+    """
+    statement = statement.order_by(*(column.desc() if order == "desc" else column.asc() for column in keyset))
+    if params.cursor:
+        statement = statement.where(_after(keyset, _decode_cursor(params.cursor, keyset), order))
+
+    # Fetch one extra row to find out if there is another page
+    rows = list((await session.exec(statement.limit(params.size + 1))).all())
+
+    next_cursor = None
+    if len(rows) > params.size:
+        rows = rows[: params.size]
+        next_cursor = _encode_cursor([_keyset_value(rows[-1], column) for column in keyset])
+
+    return page_type(items=rows, next_cursor=next_cursor)
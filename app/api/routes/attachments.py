@@ -1,15 +1,24 @@
+import asyncio
 import hashlib
+from collections.abc import AsyncGenerator, Sequence
+from datetime import timedelta
+from email.utils import format_datetime
 from typing import Any
 
 import obstore
 import structlog
 from fastapi import APIRouter, HTTPException, UploadFile
-from fastapi.responses import StreamingResponse
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
+from obstore.store import S3Store
 from opentelemetry import trace
 from opentelemetry.semconv.trace import SpanAttributes
 from opentelemetry.trace import SpanKind, Status, StatusCode
+from sqlalchemy.orm import lazyload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.deps import CurrentUser, default_responses
+from app.core.config import settings
 from app.core.deps import DatabaseDep, ObjectStoreDep
 from app.models import Message
 from app.models.attachment import Attachment, AttachmentPublic
@@ -19,7 +28,7 @@ from app.utils import content_disposition_header
 router = APIRouter()
 
 hash_chunk_size = 1024 * 1024  # 1MB chunks
-s3_chunk_size = hash_chunk_size
+download_chunk_size = 1024 * 1024  # 1MB chunks
 
 log = structlog.stdlib.get_logger("app")
 obstore_tracer = trace.get_tracer("instrumentation.obstore")
@@ -29,6 +38,45 @@ def attachment_path(attachment: Attachment) -> str:
     return f"item_{attachment.item_id}/attachments/{attachment.id}"
 
 
+async def delete_attachment_objects(store: S3Store, attachments: Sequence[Attachment]) -> None:
+    """
+    Delete the attachments' files from the object store.
+
+    The paths are deleted together, S3 bulk deletes up to 1000 keys per request rather than making
+    a request per file. Missing files aren't an error.
+    """
+
+    paths = [attachment_path(attachment) for attachment in attachments]
+    with obstore_tracer.start_as_current_span("DELETE", kind=SpanKind.CLIENT) as span:
+        span.set_attribute(SpanAttributes.HTTP_REQUEST_METHOD, "DELETE")
+        span.set_attribute("obstore.path", paths)
+        try:
+            await obstore.delete_async(store, paths)
+        except FileNotFoundError as exc:
+            # Already gone, which is all deleting them was for
+            log.warning("Attachment files were missing from object store", attachment_path=paths, exc_info=exc)
+        except Exception as exc:
+            span.set_status(Status(StatusCode.ERROR))
+            span.record_exception(exc)
+            raise
+
+
+async def get_item_attachment(session: AsyncSession, item_id: int, attachment_id: int) -> Attachment:
+    """Get an attachment that belongs to the item, in a single query."""
+
+    statement = (
+        select(Attachment)
+        .where(Attachment.id == attachment_id, Attachment.item_id == item_id)
+        # The parent item isn't needed, don't spend a second query loading it
+        .options(lazyload(Attachment.item))  # type: ignore[arg-type]
+    )
+    attachment = (await session.exec(statement)).one_or_none()
+    if not attachment:
+        log.debug("Attachment not found", item_id=item_id, attachment_id=attachment_id)
+        raise HTTPException(status_code=404, detail="Attachment not found")
+    return attachment
+
+
 @router.post("/{item_id}/attachment", responses=default_responses, response_model=AttachmentPublic)
 async def create_attachment(
     session: DatabaseDep, user: CurrentUser, store: ObjectStoreDep, item_id: int, file: UploadFile
@@ -39,30 +87,50 @@ async def create_attachment(
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
 
-    attachment = Attachment.model_validate(
-        {
-            "item_id": item.id,
-            "filename": file.filename,
-            "content_type": file.content_type,
-            "filesize": file.size,
-        }
+    # Table models aren't validated on init, so default the fields the client may leave out
+    attachment = Attachment(
+        item_id=item_id,
+        filename=file.filename or "attachment",
+        content_type=file.content_type or "application/octet-stream",
+        filesize=file.size or 0,
     )
     session.add(attachment)
-    await session.commit()
-    await session.refresh(attachment)
+    # Flush (but don't commit) so the database assigns an id, the row is only committed once the upload succeeds
+    await session.flush()
+    path = attachment_path(attachment)
 
-    # Calculate sha256sum of the file in chucks so we don't have to load it all into memory
     hash_obj = hashlib.sha256()
-    while content := await file.read(hash_chunk_size):
-        hash_obj.update(content)
-    attachment.checksum_sha256 = hash_obj.hexdigest()
-    await file.seek(0)
+
+    async def hash_and_stream() -> AsyncGenerator[bytes]:
+        # Calculate the sha256sum while the file is streamed to the object store, so it's only read once.
+        # Each chunk is hashed in a worker thread (hashlib releases the GIL) while it's being uploaded, the
+        # previous chunk must be hashed before the next one is started so they're hashed in order.
+        hashing: asyncio.Future[None] | None = None
+        while chunk := await file.read(hash_chunk_size):
+            if hashing is not None:
+                await hashing
+            hashing = asyncio.ensure_future(asyncio.to_thread(hash_obj.update, chunk))
+            yield chunk
+        if hashing is not None:
+            await hashing
 
     with obstore_tracer.start_as_current_span("PUT", kind=SpanKind.CLIENT) as span:
         span.set_attribute(SpanAttributes.HTTP_REQUEST_METHOD, "PUT")
+        span.set_attribute("obstore.path", path)
         try:
-            path = attachment_path(attachment)
-            await obstore.put_async(store, path, file.file)
+            await obstore.put_async(
+                store,
+                path,
+                hash_and_stream(),
+                # Stored with the object, so it's served with the right name and type from a presigned URL
+                attributes={
+                    "Content-Disposition": content_disposition_header(attachment.filename, "attachment"),
+                    "Content-Type": attachment.content_type,
+                },
+                use_multipart=True,
+                chunk_size=settings.s3.multipart_chunk_size,
+                max_concurrency=settings.s3.multipart_max_concurrency,
+            )
         except Exception as exc:
             span.set_status(Status(StatusCode.ERROR))
             span.record_exception(exc)
@@ -73,12 +141,13 @@ async def create_attachment(
                 attachment_path=path,
                 exc_info=exc,
             )
+            # Nothing was committed, rolling back discards the attachment row
+            await session.rollback()
             raise HTTPException(status_code=500, detail="Upload failed") from exc
 
     # Update checksum in db now that file has been uploaded
-    session.add(attachment)
+    attachment.checksum_sha256 = hash_obj.hexdigest()
     await session.commit()
-    await session.refresh(attachment)
     log.debug(
         "Attachment uploaded",
         item_id=item_id,
@@ -96,28 +165,35 @@ async def create_attachment(
 )
 async def get_attachment(
     session: DatabaseDep, user: CurrentUser, store: ObjectStoreDep, item_id: int, attachment_id: int
-) -> StreamingResponse:
+) -> Response:
     """Download an attached file."""
 
-    item = await session.get(Item, item_id)
-    if not item:
-        log.debug("Item not found", item_id=item_id)
-        raise HTTPException(status_code=404, detail="Item not found")
+    attachment = await get_item_attachment(session, item_id, attachment_id)
+    path = attachment_path(attachment)
 
-    attachment = await session.get(Attachment, attachment_id)
-    if not attachment:
-        log.debug("Attachment not found", item_id=item_id, attachment_id=attachment_id)
-        raise HTTPException(status_code=404, detail="Attachment not found")
+    if settings.s3.presigned_downloads:
+        # Let the client download straight from the object store, rather than streaming every byte through the app
+        expires_in = timedelta(seconds=settings.s3.presigned_url_expiry)
+        url = await obstore.sign_async(store, "GET", path, expires_in)
+        return RedirectResponse(url, status_code=307)
 
     with obstore_tracer.start_as_current_span("GET", kind=SpanKind.CLIENT) as span:
         span.set_attribute(SpanAttributes.HTTP_REQUEST_METHOD, "GET")
+        span.set_attribute("obstore.path", path)
         try:
-            path = attachment_path(attachment)
             resp = await obstore.get_async(store, path)
+            # Pass along the object metadata so clients and proxies can cache, resume and show progress
+            headers = {
+                "Content-Disposition": content_disposition_header(attachment.filename, "attachment"),
+                "Content-Length": str(resp.meta["size"]),
+                "Last-Modified": format_datetime(resp.meta["last_modified"], usegmt=True),
+            }
+            if resp.meta["e_tag"]:
+                headers["ETag"] = resp.meta["e_tag"]
             return StreamingResponse(
-                content=resp,
+                content=resp.stream(min_chunk_size=download_chunk_size),
                 media_type=attachment.content_type,
-                headers={"Content-Disposition": content_disposition_header(attachment.filename, "attachment")},
+                headers=headers,
             )
         except FileNotFoundError as exc:
             log.debug(
@@ -146,39 +222,24 @@ async def delete_attachment(
 ) -> Message:
     """Delete a file attachment."""
 
-    item = await session.get(Item, item_id)
-    if not item:
-        log.debug("Item not found", item_id=item_id)
-        raise HTTPException(status_code=404, detail="Item not found")
-
-    attachment = await session.get(Attachment, attachment_id)
-    if not attachment:
-        log.debug("Attachment not found", item_id=item_id, attachment_id=attachment_id)
-        raise HTTPException(status_code=404, detail="Attachment not found")
-
-    # Delete database entry (but don't commit yet)
+    attachment = await get_item_attachment(session, item_id, attachment_id)
+    path = attachment_path(attachment)
+
+    # Delete from object store first, the db entry is kept if this fails so the file isn't orphaned
+    try:
+        await delete_attachment_objects(store, [attachment])
+    except Exception as exc:
+        log.error(
+            "Delete failed",
+            item_id=item_id,
+            attachment_id=attachment_id,
+            attachment_path=path,
+            exc_info=exc,
+        )
+        raise HTTPException(status_code=500, detail="Delete failed") from exc
+
+    # File deleted from bucket (or already gone), so we can delete the db entry
     await session.delete(attachment)
-
-    with obstore_tracer.start_as_current_span("DELETE", kind=SpanKind.CLIENT) as span:
-        span.set_attribute(SpanAttributes.HTTP_REQUEST_METHOD, "DELETE")
-        # Delete from object store
-        try:
-            path = attachment_path(attachment)
-            await obstore.delete_async(store, path)
-        except FileNotFoundError as exc:
-            span.set_status(Status(StatusCode.ERROR))
-            span.record_exception(exc)
-            # This may not be needed
-            # delete_async() doesn't seem to raise a FileNotFoundError exception
-            log.warning(
-                "File was missing from object store",
-                item_id=item_id,
-                attachment_id=attachment_id,
-                attachment_path=path,
-                exc_info=exc,
-            )
-
-    # File deleted from bucket, so we can delete the db entry
     await session.commit()
     log.debug(
         "Attachment deleted",
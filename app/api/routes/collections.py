@@ -1,38 +1,52 @@
 from typing import Any, Literal
 
 from fastapi import APIRouter, HTTPException
-from fastapi_pagination.ext.sqlmodel import apaginate
-from fastapi_pagination.links import LimitOffsetPage
-from sqlmodel import column, select
+from sqlalchemy.orm import Mapped, raiseload
+from sqlmodel import col, delete, select, update
 
-from app.api.deps import CurrentUser, default_responses
+from app.api.deps import CurrentUser, default_responses, deleted_responses
+from app.api.pagination import CursorPage, CursorParamsDep, apaginate_keyset
+from app.core.db import execute
 from app.core.deps import DatabaseDep
 from app.models import Message
 from app.models.collection import Collection, CollectionCreate, CollectionPublic, CollectionUpdate
 
 router = APIRouter()
 
+# The id breaks ties between collections with the same sort value, so every row has a unique position.
+# Each keyset is backed by an index on the collection table.
+collection_keysets: dict[str, list[Mapped[Any]]] = {
+    "created_at": [col(Collection.created_at), col(Collection.id)],
+    "updated_at": [col(Collection.updated_at), col(Collection.id)],
+    "title": [col(Collection.title), col(Collection.id)],
+    "id": [col(Collection.id)],
+}
+
+# CollectionPublic is only the collection's own columns, don't load its items (and their relationships)
+collection_public_options = [raiseload("*")]
+
 
 @router.get("/")
 async def list_collections(
     session: DatabaseDep,
     user: CurrentUser,
+    pagination: CursorParamsDep,
     sort: Literal["created_at", "updated_at", "title", "id"] = "created_at",
     order: Literal["asc", "desc"] = "desc",
-) -> LimitOffsetPage[CollectionPublic]:
+) -> CursorPage[CollectionPublic]:
     """Retrieve a list of collections."""
 
-    statement = select(Collection).order_by(column(sort).desc() if order == "desc" else column(sort).asc())
-    page: LimitOffsetPage[CollectionPublic] = await apaginate(session, statement)  # type: ignore[arg-type]
-    # It feels wrong to ignore the incompatible arg-type
-    return page
+    statement = select(Collection).options(*collection_public_options)
+    return await apaginate_keyset(
+        session, statement, CursorPage[CollectionPublic], collection_keysets[sort], order, pagination
+    )
 
 
 @router.get("/{collection_id}", response_model=CollectionPublic, responses=default_responses)
 async def get_collection(session: DatabaseDep, user: CurrentUser, collection_id: int) -> Any:
     """Get collection by ID."""
 
-    collection = await session.get(Collection, collection_id)
+    collection = await session.get(Collection, collection_id, options=collection_public_options)
     if not collection:
         raise HTTPException(status_code=404, detail="Collection not found")
 
@@ -43,10 +57,9 @@ async def get_collection(session: DatabaseDep, user: CurrentUser, collection_id:
 async def create_collection(session: DatabaseDep, user: CurrentUser, collection_in: CollectionCreate) -> Any:
     """Create new collection."""
 
-    collection = Collection.model_validate(collection_in)
+    collection = Collection(**collection_in.model_dump())
     session.add(collection)
     await session.commit()
-    await session.refresh(collection)
     return collection
 
 
@@ -56,35 +69,35 @@ async def update_collection(
 ) -> Any:
     """Update a collection."""
 
-    collection = await session.get(Collection, collection_id)
+    update_dict = collection_in.model_dump(exclude_unset=True)
+    if update_dict:
+        # UPDATE ... RETURNING, rather than reading the row first and then updating it
+        statement = (
+            update(Collection)
+            .where(col(Collection.id) == collection_id)
+            .values(update_dict)
+            .returning(Collection)
+            .options(*collection_public_options)
+        )
+        collection = (await execute(session, statement)).scalars().first()
+    else:
+        collection = await session.get(Collection, collection_id, options=collection_public_options)
     if not collection:
         raise HTTPException(status_code=404, detail="Collection not found")
 
-    update_dict = collection_in.model_dump(exclude_unset=True)
-    collection.sqlmodel_update(update_dict)
-    session.add(collection)
     await session.commit()
-    await session.refresh(collection)
     return collection
 
 
-@router.delete(
-    "/{collection_id}",
-    responses={
-        **default_responses,
-        200: {
-            "model": Message,
-            "content": {"application/json": {"example": {"detail": "Collection deleted successfully"}}},
-        },
-    },
-)
+@router.delete("/{collection_id}", responses=deleted_responses("Collection deleted successfully"))
 async def delete_collection(session: DatabaseDep, user: CurrentUser, collection_id: int) -> Message:
     """Delete a collection."""
 
-    collection = await session.get(Collection, collection_id)
-    if not collection:
+    # A single DELETE, the database sets the items' collection_id to NULL (ON DELETE SET NULL) rather than the ORM
+    # loading them to update one by one
+    statement = delete(Collection).where(col(Collection.id) == collection_id).returning(col(Collection.id))
+    if not (await execute(session, statement)).first():
         raise HTTPException(status_code=404, detail="Collection not found")
 
-    await session.delete(collection)
     await session.commit()
     return Message(detail="Collection deleted successfully")
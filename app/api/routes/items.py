@@ -1,13 +1,14 @@
-import datetime
 from typing import Annotated, Any, Literal
 
+import structlog
 from fastapi import APIRouter, HTTPException, Query
-from fastapi_pagination.ext.sqlmodel import apaginate
-from fastapi_pagination.links import LimitOffsetPage
-from sqlmodel import col, column, exists, select
+from sqlalchemy.orm import Mapped, joinedload, raiseload, selectinload
+from sqlmodel import col, func, select
 
-from app.api.deps import CurrentUser, default_responses
-from app.core.deps import DatabaseDep
+from app.api.deps import CurrentUser, default_responses, deleted_responses
+from app.api.pagination import CursorPage, CursorParamsDep, apaginate_keyset
+from app.api.routes.attachments import delete_attachment_objects
+from app.core.deps import DatabaseDep, ObjectStoreDep
 from app.models import Message
 from app.models.collection import Collection
 from app.models.item import Item, ItemCreate, ItemPublic, ItemType, ItemUpdate
@@ -16,11 +17,35 @@ from app.models.tag import ItemTagLink
 
 router = APIRouter()
 
+log = structlog.stdlib.get_logger("app")
+
+# The id breaks ties between items with the same sort values, so every row has a unique position.
+# The collection and stack sorts are on columns of the joined table.
+item_keysets: dict[str, list[Mapped[Any]]] = {
+    "created_at": [col(Item.created_at), col(Item.id)],
+    "updated_at": [col(Item.updated_at), col(Item.id)],
+    "title": [col(Item.title), col(Item.id)],
+    "collection": [col(Collection.title), col(Item.id)],
+    "stack": [col(Stack.title), col(Item.shelf), col(Item.slot), col(Item.id)],
+    "id": [col(Item.id)],
+}
+
+# Load what ItemPublic serializes and nothing past it, the related models' own relationships are selectin
+# loaded by default, which would load every other item of the item's collection, stack and tags.
+item_public_options = [
+    joinedload(Item.collection).raiseload("*"),  # type: ignore[arg-type]
+    joinedload(Item.stack).raiseload("*"),  # type: ignore[arg-type]
+    selectinload(Item.tags).raiseload("*"),  # type: ignore[arg-type]
+    selectinload(Item.attachments).raiseload("*"),  # type: ignore[arg-type]
+    raiseload("*"),
+]
+
 
 @router.get("/")
 async def list_items(
     session: DatabaseDep,
     current_user: CurrentUser,
+    pagination: CursorParamsDep,
     sort: Literal["created_at", "updated_at", "title", "collection", "stack", "id"] = "created_at",
     order: Literal["asc", "desc"] = "desc",
     type: Annotated[list[ItemType] | None, Query(description="Filter results to specified item types.")] = None,
@@ -36,46 +61,29 @@ async def list_items(
         int | None,
         Query(description="Filter results to items in the specified stack."),
     ] = None,
-) -> LimitOffsetPage[ItemPublic]:
-    # ) -> ItemsList:
+) -> CursorPage[ItemPublic]:
     """Retrieve a list of items."""
 
+    statement = select(Item).options(*item_public_options)
     if sort == "collection":
-        statement = (
-            select(Item)
-            .join(Collection, isouter=True)
-            .order_by(col(Collection.title).desc() if order == "desc" else col(Collection.title).asc())
-        )
+        statement = statement.join(Collection, isouter=True)
     elif sort == "stack":
-        if order == "desc":
-            statement = (
-                select(Item)
-                .join(Stack, isouter=True)
-                .order_by(col(Stack.title).desc())
-                .order_by(column("shelf").desc())
-                .order_by(column("slot").desc())
-            )
-        else:
-            statement = (
-                select(Item)
-                .join(Stack, isouter=True)
-                .order_by(col(Stack.title).asc())
-                .order_by(column("shelf").asc())
-                .order_by(column("slot").asc())
-            )
-    else:
-        statement = select(Item).order_by(column(sort).desc() if order == "desc" else column(sort).asc())
+        statement = statement.join(Stack, isouter=True)
 
     if type:
         statement = statement.where(col(Item.item_type).in_(type))
 
     if tag_id:
-        for id in tag_id:
-            # Create a subquery that checks if the item has this specific tag
-            exists_query = select(ItemTagLink).where(ItemTagLink.item_id == Item.id, ItemTagLink.tag_id == id)
-
-            # Add an EXISTS filter for this tag
-            statement = statement.where(exists(exists_query))
+        # Items linked to every one of the tags, one grouped subquery instead of an EXISTS per tag.
+        # (item_id, tag_id) is the link table's primary key, so each tag is only counted once per item.
+        tagged = (
+            select(ItemTagLink.item_id)
+            .where(col(ItemTagLink.tag_id).in_(tag_id))
+            .group_by(col(ItemTagLink.item_id))
+            .having(func.count() == len(set(tag_id)))
+            .subquery()
+        )
+        statement = statement.join(tagged, col(Item.id) == tagged.c.item_id)
 
     if collection_id:
         statement = statement.where(col(Item.collection_id) == collection_id)
@@ -83,16 +91,14 @@ async def list_items(
     if stack_id:
         statement = statement.where(col(Item.stack_id) == stack_id)
 
-    page: LimitOffsetPage[ItemPublic] = await apaginate(session, statement)  # type: ignore[arg-type]
-    # It feels wrong to ignore the incompatible arg-type
-    return page
+    return await apaginate_keyset(session, statement, CursorPage[ItemPublic], item_keysets[sort], order, pagination)
 
 
 @router.get("/{item_id}", response_model=ItemPublic, responses=default_responses)
 async def get_item(session: DatabaseDep, current_user: CurrentUser, item_id: int) -> Any:
     """Get item by ID."""
 
-    item = await session.get(Item, item_id)
+    item = await session.get(Item, item_id, options=item_public_options)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
 
@@ -103,47 +109,46 @@ async def get_item(session: DatabaseDep, current_user: CurrentUser, item_id: int
 async def create_item(*, session: DatabaseDep, current_user: CurrentUser, item_in: ItemCreate) -> Any:
     """Create new item."""
 
-    item = Item.model_validate(item_in)
+    item = Item(**item_in.model_dump())
     session.add(item)
     await session.commit()
-    await session.refresh(item)
-    return item
+    # The columns came back with the INSERT, but the relationships in the response still have to be loaded
+    return await session.get(Item, item.id, options=item_public_options, populate_existing=True)
 
 
 @router.put("/{item_id}", response_model=ItemPublic, responses=default_responses)
 async def update_item(*, session: DatabaseDep, current_user: CurrentUser, item_id: int, item_in: ItemUpdate) -> Any:
     """Update a item."""
 
-    item = await session.get(Item, item_id)
+    item = await session.get(Item, item_id, options=item_public_options)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
 
     update_dict = item_in.model_dump(exclude_unset=True)
     item.sqlmodel_update(update_dict)
-    item.updated_at = datetime.datetime.now(tz=datetime.UTC)
-    session.add(item)
     await session.commit()
-    await session.refresh(item)
+    if update_dict.keys() & {"collection_id", "stack_id"}:
+        # Changing a foreign key doesn't update the loaded relationship, load the new collection/stack
+        return await session.get(Item, item_id, options=item_public_options, populate_existing=True)
     return item
 
 
-@router.delete(
-    "/{item_id}",
-    responses={
-        **default_responses,
-        200: {
-            "model": Message,
-            "content": {"application/json": {"example": {"detail": "Item deleted successfully"}}},
-        },
-    },
-)
-async def delete_item(session: DatabaseDep, current_user: CurrentUser, item_id: int) -> Message:
+@router.delete("/{item_id}", responses=deleted_responses("Item deleted successfully"))
+async def delete_item(session: DatabaseDep, current_user: CurrentUser, store: ObjectStoreDep, item_id: int) -> Message:
     """Delete an item."""
 
     item = await session.get(Item, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
 
+    # The attachment rows are deleted along with the item, delete their files first so they aren't orphaned
+    if item.attachments:
+        try:
+            await delete_attachment_objects(store, item.attachments)
+        except Exception as exc:
+            log.error("Deleting attachments failed", item_id=item_id, exc_info=exc)
+            raise HTTPException(status_code=500, detail="Delete failed") from exc
+
     await session.delete(item)
     await session.commit()
     return Message(detail="Item deleted successfully")
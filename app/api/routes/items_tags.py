@@ -1,8 +1,11 @@
 from typing import Any
 
 from fastapi import APIRouter, HTTPException
+from sqlalchemy.orm import lazyload
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.deps import CurrentUser, default_responses
+from app.api.routes.items import item_public_options
 from app.core.deps import DatabaseDep
 from app.models.item import Item, ItemPublic
 from app.models.tag import Tag
@@ -10,26 +13,31 @@ from app.models.tag import Tag
 router = APIRouter()
 
 
+async def get_tag(session: AsyncSession, tag_id: int) -> Tag:
+    # Only the tag itself is needed, don't load every item that has the tag (and their relationships)
+    tag = await session.get(Tag, tag_id, options=[lazyload(Tag.items)])  # type: ignore[arg-type]
+    if not tag:
+        raise HTTPException(status_code=404, detail="Tag not found")
+    return tag
+
+
 @router.post("/{item_id}/tag/{tag_id}", response_model=ItemPublic, responses=default_responses)
 async def add_tag(session: DatabaseDep, user: CurrentUser, item_id: int, tag_id: int) -> Any:
     """Add a tag to an item."""
 
-    item = await session.get(Item, item_id)
+    item = await session.get(Item, item_id, options=item_public_options)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
 
-    tag = await session.get(Tag, tag_id)
-    if not tag:
-        raise HTTPException(status_code=404, detail="Tag not found")
+    tag = await get_tag(session, tag_id)
 
-    # Item already has that tag
-    if item.tags.count(tag):
+    # Item already has that tag, compare ids instead of the (field by field) model equality
+    if tag.id in {item_tag.id for item_tag in item.tags}:
         return item
 
     item.tags.append(tag)
-    session.add(item)
+    # item.tags is already up to date and the item's row didn't change, no need to refresh it
     await session.commit()
-    await session.refresh(item)
     return item
 
 
@@ -37,20 +45,18 @@ async def add_tag(session: DatabaseDep, user: CurrentUser, item_id: int, tag_id:
 async def remove_tag(session: DatabaseDep, user: CurrentUser, item_id: int, tag_id: int) -> Any:
     """Remove a tag from a item."""
 
-    item: Item | None = await session.get(Item, item_id)
+    item: Item | None = await session.get(Item, item_id, options=item_public_options)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
 
-    tag = await session.get(Tag, tag_id)
-    if not tag:
-        raise HTTPException(status_code=404, detail="Tag not found")
+    tag = await get_tag(session, tag_id)
 
     # Item doesn't have have that tag, nothing to do
-    if not item.tags.count(tag):
+    tag_index = next((index for index, item_tag in enumerate(item.tags) if item_tag.id == tag.id), None)
+    if tag_index is None:
         return item
 
-    item.tags.remove(tag)
-    session.add(item)
+    del item.tags[tag_index]
+    # item.tags is already up to date and the item's row didn't change, no need to refresh it
     await session.commit()
-    await session.refresh(item)
     return item
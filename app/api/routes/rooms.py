@@ -1,42 +1,67 @@
-from typing import Any, Literal
+from typing import Annotated, Any, Literal
 
-from fastapi import APIRouter, HTTPException
-from fastapi_pagination.ext.sqlmodel import apaginate
-from fastapi_pagination.links import LimitOffsetPage
-from sqlmodel import column, select
+from fastapi import APIRouter, Header, HTTPException, Response
+from sqlalchemy.orm import Mapped, raiseload
+from sqlmodel import col, delete, select, update
 
-from app.api.deps import CurrentUser, default_responses
+from app.api.deps import CurrentUser, default_responses, deleted_responses
+from app.api.pagination import CursorPage, CursorParamsDep, apaginate_keyset
+from app.core.db import execute
 from app.core.deps import DatabaseDep
 from app.models import Message
 from app.models.room import Room, RoomCreate, RoomPublic, RoomUpdate
+from app.utils import etag_matches
 
 router = APIRouter()
 
+# The id breaks ties between rooms with the same sort value, so every row has a unique position.
+# Each keyset is backed by an index on the room table.
+room_keysets: dict[str, list[Mapped[Any]]] = {
+    "created_at": [col(Room.created_at), col(Room.id)],
+    "updated_at": [col(Room.updated_at), col(Room.id)],
+    "title": [col(Room.title), col(Room.id)],
+    "id": [col(Room.id)],
+}
+
+# RoomPublic is only the room's own columns, don't load its stacks (and their items, and so on)
+room_public_options = [raiseload("*")]
+
 
 @router.get("/")
 async def list_rooms(
     session: DatabaseDep,
     current_user: CurrentUser,
+    pagination: CursorParamsDep,
     sort: Literal["created_at", "updated_at", "id", "title"] = "created_at",
     order: Literal["asc", "desc"] = "desc",
-) -> LimitOffsetPage[RoomPublic]:
+) -> CursorPage[RoomPublic]:
     """Retrieve a list of rooms."""
 
-    statement = select(Room).order_by(column(sort).desc() if order == "desc" else column(sort).asc())
-
-    page: LimitOffsetPage[RoomPublic] = await apaginate(session, statement)  # type: ignore[arg-type]
-    # It feels wrong to ignore the incompatible arg-type
-    return page
+    statement = select(Room).options(*room_public_options)
+    return await apaginate_keyset(session, statement, CursorPage[RoomPublic], room_keysets[sort], order, pagination)
 
 
 @router.get("/{room_id}", response_model=RoomPublic, responses=default_responses)
-async def get_room(session: DatabaseDep, current_user: CurrentUser, room_id: int) -> Any:
+async def get_room(
+    session: DatabaseDep,
+    current_user: CurrentUser,
+    response: Response,
+    room_id: int,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Any:
     """Get room by ID."""
 
-    room = await session.get(Room, room_id)
+    room = await session.get(Room, room_id, options=room_public_options)
     if not room:
         raise HTTPException(status_code=404, detail="Room not found")
 
+    # RoomPublic is only the room's own columns, any change to them bumps updated_at
+    modified = room.updated_at or room.created_at
+    etag = f'W/"{room.id}-{modified.timestamp() if modified else 0}"'
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
     return room
 
 
@@ -44,10 +69,9 @@ async def get_room(session: DatabaseDep, current_user: CurrentUser, room_id: int
 async def create_room(session: DatabaseDep, current_user: CurrentUser, room_in: RoomCreate) -> Any:
     """Create new room."""
 
-    room = Room.model_validate(room_in)
+    room = Room(**room_in.model_dump())
     session.add(room)
     await session.commit()
-    await session.refresh(room)
     return room
 
 
@@ -55,35 +79,35 @@ async def create_room(session: DatabaseDep, current_user: CurrentUser, room_in:
 async def update_room(session: DatabaseDep, current_user: CurrentUser, room_id: int, room_in: RoomUpdate) -> Any:
     """Update a room."""
 
-    room = await session.get(Room, room_id)
+    update_dict = room_in.model_dump(exclude_unset=True)
+    if update_dict:
+        # UPDATE ... RETURNING, rather than reading the row first and then updating it
+        statement = (
+            update(Room)
+            .where(col(Room.id) == room_id)
+            .values(update_dict)
+            .returning(Room)
+            .options(*room_public_options)
+        )
+        room = (await execute(session, statement)).scalars().first()
+    else:
+        room = await session.get(Room, room_id, options=room_public_options)
     if not room:
         raise HTTPException(status_code=404, detail="Room not found")
 
-    update_dict = room_in.model_dump(exclude_unset=True)
-    room.sqlmodel_update(update_dict)
-    session.add(room)
     await session.commit()
-    await session.refresh(room)
     return room
 
 
-@router.delete(
-    "/{room_id}",
-    responses={
-        **default_responses,
-        200: {
-            "model": Message,
-            "content": {"application/json": {"example": {"detail": "Room deleted successfully"}}},
-        },
-    },
-)
+@router.delete("/{room_id}", responses=deleted_responses("Room deleted successfully"))
 async def delete_room(session: DatabaseDep, current_user: CurrentUser, room_id: int) -> Message:
     """Delete a room."""
 
-    room = await session.get(Room, room_id)
-    if not room:
+    # A single DELETE, the database sets the stacks' room_id to NULL (ON DELETE SET NULL) rather than the ORM
+    # loading them to update one by one
+    statement = delete(Room).where(col(Room.id) == room_id).returning(col(Room.id))
+    if not (await execute(session, statement)).first():
         raise HTTPException(status_code=404, detail="Room not found")
 
-    await session.delete(room)
     await session.commit()
     return Message(detail="Room deleted successfully")
@@ -1,11 +1,12 @@
 from typing import Any, Literal
 
 from fastapi import APIRouter, HTTPException
-from fastapi_pagination.ext.sqlmodel import apaginate
-from fastapi_pagination.links import LimitOffsetPage
-from sqlmodel import col, column, select
+from sqlalchemy.orm import Mapped, contains_eager, raiseload
+from sqlmodel import col, delete, select, update
 
-from app.api.deps import CurrentUser, default_responses
+from app.api.deps import CurrentUser, default_responses, deleted_responses
+from app.api.pagination import CursorPage, CursorParamsDep, apaginate_keyset
+from app.core.db import execute
 from app.core.deps import DatabaseDep
 from app.models import Message
 from app.models.room import Room
@@ -13,35 +14,44 @@ from app.models.stack import Stack, StackCreate, StackPublic, StackUpdate
 
 router = APIRouter()
 
+# The id breaks ties between stacks with the same sort value, so every row has a unique position.
+# Each keyset is backed by an index on the stack table, the room sort is on a column of the joined table.
+stack_keysets: dict[str, list[Mapped[Any]]] = {
+    "created_at": [col(Stack.created_at), col(Stack.id)],
+    "updated_at": [col(Stack.updated_at), col(Stack.id)],
+    "title": [col(Stack.title), col(Stack.id)],
+    "room": [col(Room.title), col(Stack.id)],
+    "id": [col(Stack.id)],
+}
+
+# StackPublic is only the stack's own columns, don't load its room and items (and their relationships)
+stack_public_options = [raiseload("*")]
+
 
 @router.get("/")
 async def list_stacks(
     session: DatabaseDep,
     current_user: CurrentUser,
+    pagination: CursorParamsDep,
     sort: Literal["created_at", "updated_at", "id", "title", "room"] = "created_at",
     order: Literal["asc", "desc"] = "desc",
-) -> LimitOffsetPage[StackPublic]:
+) -> CursorPage[StackPublic]:
     """Retrieve a list of stacks."""
 
+    statement = select(Stack).options(*stack_public_options)
     if sort == "room":
-        statement = (
-            select(Stack)
-            .join(Room, isouter=True)
-            .order_by(col(Room.title).desc() if order == "desc" else col(Room.title).asc())
-        )
-    else:
-        statement = select(Stack).order_by(column(sort).desc() if order == "desc" else column(sort).asc())
+        # The next cursor needs the last stack's room title, fill in the relationship from the join
+        statement = statement.join(Room, isouter=True)
+        statement = statement.options(contains_eager(Stack.room).raiseload("*"))  # type: ignore[arg-type]
 
-    page: LimitOffsetPage[StackPublic] = await apaginate(session, statement)  # type: ignore[arg-type]
-    # It feels wrong to ignore the incompatible arg-type
-    return page
+    return await apaginate_keyset(session, statement, CursorPage[StackPublic], stack_keysets[sort], order, pagination)
 
 
 @router.get("/{stack_id}", response_model=StackPublic, responses=default_responses)
 async def get_stack(session: DatabaseDep, current_user: CurrentUser, stack_id: int) -> Any:
     """Get stack by ID."""
 
-    stack = await session.get(Stack, stack_id)
+    stack = await session.get(Stack, stack_id, options=stack_public_options)
     if not stack:
         raise HTTPException(status_code=404, detail="Stack not found")
 
@@ -52,10 +62,9 @@ async def get_stack(session: DatabaseDep, current_user: CurrentUser, stack_id: i
 async def create_stack(session: DatabaseDep, current_user: CurrentUser, stack_in: StackCreate) -> Any:
     """Create new stack."""
 
-    stack = Stack.model_validate(stack_in)
+    stack = Stack(**stack_in.model_dump())
     session.add(stack)
     await session.commit()
-    await session.refresh(stack)
     return stack
 
 
@@ -63,35 +72,35 @@ async def create_stack(session: DatabaseDep, current_user: CurrentUser, stack_in
 async def update_stack(session: DatabaseDep, current_user: CurrentUser, stack_id: int, stack_in: StackUpdate) -> Any:
     """Update a stack."""
 
-    stack = await session.get(Stack, stack_id)
+    update_dict = stack_in.model_dump(exclude_unset=True)
+    if update_dict:
+        # UPDATE ... RETURNING, rather than reading the row first and then updating it
+        statement = (
+            update(Stack)
+            .where(col(Stack.id) == stack_id)
+            .values(update_dict)
+            .returning(Stack)
+            .options(*stack_public_options)
+        )
+        stack = (await execute(session, statement)).scalars().first()
+    else:
+        stack = await session.get(Stack, stack_id, options=stack_public_options)
     if not stack:
         raise HTTPException(status_code=404, detail="Stack not found")
 
-    update_dict = stack_in.model_dump(exclude_unset=True)
-    stack.sqlmodel_update(update_dict)
-    session.add(stack)
     await session.commit()
-    await session.refresh(stack)
     return stack
 
 
-@router.delete(
-    "/{stack_id}",
-    responses={
-        **default_responses,
-        200: {
-            "model": Message,
-            "content": {"application/json": {"example": {"detail": "Stack deleted successfully"}}},
-        },
-    },
-)
+@router.delete("/{stack_id}", responses=deleted_responses("Stack deleted successfully"))
 async def delete_stack(session: DatabaseDep, current_user: CurrentUser, stack_id: int) -> Message:
     """Delete a stack."""
 
-    stack = await session.get(Stack, stack_id)
-    if not stack:
+    # A single DELETE, the database sets the items' stack_id to NULL (ON DELETE SET NULL) rather than the ORM
+    # loading them to update one by one
+    statement = delete(Stack).where(col(Stack.id) == stack_id).returning(col(Stack.id))
+    if not (await execute(session, statement)).first():
         raise HTTPException(status_code=404, detail="Stack not found")
 
-    await session.delete(stack)
     await session.commit()
     return Message(detail="Stack deleted successfully")
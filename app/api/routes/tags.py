@@ -1,38 +1,50 @@
 from typing import Any, Literal
 
 from fastapi import APIRouter, HTTPException
-from fastapi_pagination.ext.sqlmodel import apaginate
-from fastapi_pagination.links import LimitOffsetPage
-from sqlmodel import column, select
+from sqlalchemy.orm import Mapped, raiseload
+from sqlmodel import col, delete, select, update
 
-from app.api.deps import CurrentUser, default_responses
+from app.api.deps import CurrentUser, default_responses, deleted_responses
+from app.api.pagination import CursorPage, CursorParamsDep, apaginate_keyset
+from app.core.db import execute
 from app.core.deps import DatabaseDep
 from app.models import Message
-from app.models.tag import Tag, TagCreate, TagPublic, TagUpdate
+from app.models.tag import ItemTagLink, Tag, TagCreate, TagPublic, TagUpdate
 
 router = APIRouter()
 
+# The id breaks ties between tags with the same sort value, so every row has a unique position.
+# Each keyset is backed by an index on the tag table.
+tag_keysets: dict[str, list[Mapped[Any]]] = {
+    "created_at": [col(Tag.created_at), col(Tag.id)],
+    "updated_at": [col(Tag.updated_at), col(Tag.id)],
+    "name": [col(Tag.name), col(Tag.id)],
+    "id": [col(Tag.id)],
+}
+
+# TagPublic is only the tag's own columns, don't load every item with the tag
+tag_public_options = [raiseload("*")]
+
 
 @router.get("/")
 async def list_tags(
     session: DatabaseDep,
     current_user: CurrentUser,
+    pagination: CursorParamsDep,
     sort: Literal["created_at", "updated_at", "id", "name"] = "created_at",
     order: Literal["asc", "desc"] = "desc",
-) -> LimitOffsetPage[TagPublic]:
+) -> CursorPage[TagPublic]:
     """Retrieve a list of tags."""
 
-    statement = select(Tag).order_by(column(sort).desc() if order == "desc" else column(sort).asc())
-    page: LimitOffsetPage[TagPublic] = await apaginate(session, statement)  # type: ignore[arg-type]
-    # It feels wrong to ignore the incompatible arg-type
-    return page
+    statement = select(Tag).options(*tag_public_options)
+    return await apaginate_keyset(session, statement, CursorPage[TagPublic], tag_keysets[sort], order, pagination)
 
 
 @router.get("/{tag_id}", response_model=TagPublic, responses=default_responses)
 async def get_tag(session: DatabaseDep, current_user: CurrentUser, tag_id: int) -> Any:
     """Get tag by ID."""
 
-    tag = await session.get(Tag, tag_id)
+    tag = await session.get(Tag, tag_id, options=tag_public_options)
     if not tag:
         raise HTTPException(status_code=404, detail="Tag not found")
 
@@ -43,10 +55,9 @@ async def get_tag(session: DatabaseDep, current_user: CurrentUser, tag_id: int)
 async def create_tag(session: DatabaseDep, current_user: CurrentUser, tag_in: TagCreate) -> Any:
     """Create new tag."""
 
-    tag = Tag.model_validate(tag_in)
+    tag = Tag(**tag_in.model_dump())
     session.add(tag)
     await session.commit()
-    await session.refresh(tag)
     return tag
 
 
@@ -54,35 +65,32 @@ async def create_tag(session: DatabaseDep, current_user: CurrentUser, tag_in: Ta
 async def update_tag(session: DatabaseDep, current_user: CurrentUser, tag_id: int, tag_in: TagUpdate) -> Any:
     """Update a tag."""
 
-    tag = await session.get(Tag, tag_id)
+    update_dict = tag_in.model_dump(exclude_unset=True)
+    if update_dict:
+        # UPDATE ... RETURNING, rather than reading the row first and then updating it
+        statement = (
+            update(Tag).where(col(Tag.id) == tag_id).values(update_dict).returning(Tag).options(*tag_public_options)
+        )
+        tag = (await execute(session, statement)).scalars().first()
+    else:
+        tag = await session.get(Tag, tag_id, options=tag_public_options)
     if not tag:
         raise HTTPException(status_code=404, detail="Tag not found")
 
-    update_dict = tag_in.model_dump(exclude_unset=True)
-    tag.sqlmodel_update(update_dict)
-    session.add(tag)
     await session.commit()
-    await session.refresh(tag)
     return tag
 
 
-@router.delete(
-    "/{tag_id}",
-    responses={
-        **default_responses,
-        200: {
-            "model": Message,
-            "content": {"application/json": {"example": {"detail": "Tag deleted successfully"}}},
-        },
-    },
-)
+@router.delete("/{tag_id}", responses=deleted_responses("Tag deleted successfully"))
 async def delete_tag(session: DatabaseDep, current_user: CurrentUser, tag_id: int) -> Message:
     """Delete a tag."""
 
-    tag = await session.get(Tag, tag_id)
-    if not tag:
+    # The tag's item links have no ON DELETE, remove them in one statement rather than the ORM loading every item
+    # with the tag to unlink them
+    await execute(session, delete(ItemTagLink).where(col(ItemTagLink.tag_id) == tag_id))
+    statement = delete(Tag).where(col(Tag.id) == tag_id).returning(col(Tag.id))
+    if not (await execute(session, statement)).first():
         raise HTTPException(status_code=404, detail="Tag not found")
 
-    await session.delete(tag)
     await session.commit()
     return Message(detail="Tag deleted successfully")
@@ -1,30 +1,41 @@
 from typing import Any, Literal
 
 from fastapi import APIRouter, HTTPException
-from fastapi_pagination.ext.sqlmodel import apaginate
-from fastapi_pagination.links import LimitOffsetPage
-from sqlmodel import column, select
+from sqlalchemy.orm import Mapped, raiseload
+from sqlmodel import col, select
 
 from app.api.deps import CurrentUser, default_responses
+from app.api.pagination import CursorPage, CursorParamsDep, apaginate_keyset
 from app.core.deps import DatabaseDep
 from app.models.user import User, UserPublic
 
 router = APIRouter()
 
+# The id breaks ties between users with the same sort value, so every row has a unique position.
+# Each keyset is backed by an index on the user table.
+user_keysets: dict[str, list[Mapped[Any]]] = {
+    "created_at": [col(User.created_at), col(User.id)],
+    "updated_at": [col(User.updated_at), col(User.id)],
+    "email": [col(User.email), col(User.id)],
+    "name": [col(User.name), col(User.id)],
+    "username": [col(User.username), col(User.id)],
+    "id": [col(User.id)],
+}
+
 
 @router.get("/")
 async def list_users(
     session: DatabaseDep,
     current_user: CurrentUser,
+    pagination: CursorParamsDep,
     sort: Literal["created_at", "updated_at", "id", "email", "name", "username"] = "created_at",
     order: Literal["asc", "desc"] = "desc",
-) -> LimitOffsetPage[UserPublic]:
+) -> CursorPage[UserPublic]:
     """Retrieve a list of users."""
 
-    statement = select(User).order_by(column(sort).desc() if order == "desc" else column(sort).asc())
-    page: LimitOffsetPage[UserPublic] = await apaginate(session, statement)  # type: ignore[arg-type]
-    # It feels wrong to ignore the incompatible arg-type
-    return page
+    # UserPublic doesn't include the user's sessions
+    statement = select(User).options(raiseload("*"))
+    return await apaginate_keyset(session, statement, CursorPage[UserPublic], user_keysets[sort], order, pagination)
 
 
 @router.get("/{user_id}", response_model=UserPublic, responses=default_responses)
@@ -1,13 +1,16 @@
+import asyncio
+import time
 from datetime import UTC, datetime
 from typing import Any
 
-import httpx
 import jwt
 import structlog
 from jwt import PyJWKSet
 from jwt.exceptions import InvalidTokenError
 from pydantic import AnyHttpUrl, BaseModel, ConfigDict, Field
 
+from app.core.http import http_client
+
 log = structlog.get_logger("oidc")
 
 
@@ -781,52 +784,71 @@ class ProviderMetadata(AuthBaseModel):
 class Provider:
     discovery_url: AnyHttpUrl
     """The OpenID Connect discovery URL"""
+    metadata_ttl: float
+    """How long (in seconds) to cache the discovery document for"""
     _metadata: ProviderMetadata | None = None
     """OpenID Provider Metadata"""
+    _metadata_fetched_at: float = 0.0
+    """Monotonic time when the discovery document was fetched"""
     _jwks: PyJWKSet | None = None
     """JSON Web Key Set"""
     last_updated: datetime | None = None
     """Time when the discovery data was fetched"""
 
-    def __init__(self, discovery_url: AnyHttpUrl):
+    def __init__(self, discovery_url: AnyHttpUrl, metadata_ttl: float = 3600):
         self.discovery_url = discovery_url
+        self.metadata_ttl = metadata_ttl
+        self._metadata_lock = asyncio.Lock()
+        self._jwks_lock = asyncio.Lock()
+
+    def _metadata_fresh(self) -> bool:
+        return self._metadata is not None and time.monotonic() - self._metadata_fetched_at < self.metadata_ttl
 
     async def get_metadata(self) -> ProviderMetadata:
-        if self._metadata:
-            # TODO: Add cache expiry
+        if self._metadata and self._metadata_fresh():
             return self._metadata
 
-        discovery_url = str(self.discovery_url)
-        log.info("Fetching OIDC Discovery document", url=discovery_url)
-        try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                discovery_response = await client.get(discovery_url)
+        # Only one request fetches the document, concurrent callers wait for it and use the result
+        async with self._metadata_lock:
+            if self._metadata and self._metadata_fresh():
+                return self._metadata
+
+            discovery_url = str(self.discovery_url)
+            log.info("Fetching OIDC Discovery document", url=discovery_url)
+            try:
+                discovery_response = await http_client.get(discovery_url)
                 discovery_response.raise_for_status()
                 self._metadata = ProviderMetadata.model_validate(discovery_response.json())
+                self._metadata_fetched_at = time.monotonic()
                 log.info("Provider metadata updated", issuer=str(self._metadata.issuer))
                 return self._metadata
-        except Exception as exc:
-            raise OpenIDConnectDiscoveryError(f"Failed to fetch OpenID Connect discovery document: {exc}") from exc
+            except Exception as exc:
+                raise OpenIDConnectDiscoveryError(f"Failed to fetch OpenID Connect discovery document: {exc}") from exc
 
     async def get_jwks(self, refresh: bool = False) -> PyJWKSet:
         if self._jwks and not refresh:
             # TODO: Add cache expiry
             return self._jwks
 
-        metadata = await self.get_metadata()
-        jwks_uri = str(metadata.jwks_uri)
+        # Only one request fetches the key set, concurrent callers wait for it and use the result
+        last_updated = self.last_updated
+        async with self._jwks_lock:
+            if self._jwks and self.last_updated != last_updated:
+                return self._jwks
+
+            metadata = await self.get_metadata()
+            jwks_uri = str(metadata.jwks_uri)
 
-        log.info("Fetching JWKS document", url=jwks_uri)
-        try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                jwks_response = await client.get(jwks_uri)
+            log.info("Fetching JWKS document", url=jwks_uri)
+            try:
+                jwks_response = await http_client.get(jwks_uri)
                 jwks_response.raise_for_status()
                 self._jwks = PyJWKSet.from_dict(jwks_response.json())
                 self.last_updated = datetime.now(tz=UTC)
                 log.info("JWKS updated", key_count=len(self._jwks.keys))
                 return self._jwks
-        except Exception as exc:
-            raise OpenIDConnectDiscoveryError(f"Failed to fetch JWKS document: {exc}") from exc
+            except Exception as exc:
+                raise OpenIDConnectDiscoveryError(f"Failed to fetch JWKS document: {exc}") from exc
 
     async def decode_token(self, token: str, audience: str | None = None, nonce: str | None = None) -> dict[str, Any]:
         """
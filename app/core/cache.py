@@ -0,0 +1,41 @@
+import time
+from collections import OrderedDict
+
+
+class TTLCache[K, V]:
+    """
+    A small in-process LRU cache, entries expire `ttl` seconds after they were set.
+
+    Only meant to be used from the event loop, it is not thread safe. Every worker process has its
+    own cache, so keep the TTL short and invalidate entries that are changed by this process.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """Cache the value, `ttl` overrides the cache's default for this entry."""
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            # Evict the least recently used entry
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
@@ -61,6 +61,12 @@ class TelemetrySettings(BaseModel):
         False,
         description="Output traces/spans directly to the console. The log format setting does not apply to traces/spans.",  # noqa: E501
     )
+    sample_ratio: float = Field(
+        1.0,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of new traces to sample, traces started by an upstream service follow its sampling decision.",  # noqa: E501
+    )
 
 
 class PrometheusSettings(BaseModel):
@@ -85,6 +91,23 @@ class MetricsSettings(BaseModel):
     prometheus: PrometheusSettings = PrometheusSettings()
 
 
+class DatabasePoolSettings(BaseModel):
+    """
+    Database connection pool, each worker process has its own pool.
+
+    ref: https://docs.sqlalchemy.org/en/20/core/pooling.html
+    """
+
+    size: int = Field(20, ge=1, description="Number of connections kept open in the pool.")
+    max_overflow: int = Field(20, ge=0, description="Extra connections allowed when the pool is exhausted.")
+    timeout: float = Field(30, gt=0, description="Seconds to wait for a connection before giving up.")
+    recycle: int = Field(1800, description="Replace connections older than this many seconds, -1 to disable.")
+    pre_ping: bool = Field(True, description="Test connections when they're checked out, replacing dead ones.")
+    warm: int = Field(
+        5, ge=0, description="Connections to open at start-up, so the first requests don't wait for them. 0 to disable."
+    )
+
+
 class CorsSettings(BaseModel):
     """Cross-Origin Resource Sharing (CORS)"""
 
@@ -119,6 +142,21 @@ class S3Settings(BaseModel):
     )
     allow_http: bool = Field(False, description="Allow connecting over HTTP.")
     allow_invalid_certificates: bool = Field(False, description="Allow invalid/untrusted certificates.")
+    multipart_chunk_size: int = Field(
+        16 * 1024 * 1024,
+        ge=5 * 1024 * 1024,
+        description="Part size in bytes for multipart uploads, S3 requires at least 5MiB.",
+    )
+    presigned_downloads: bool = Field(
+        False,
+        description="Redirect attachment downloads to a short-lived presigned URL, instead of streaming them through the app. The endpoint must be reachable by clients.",  # noqa: E501
+    )
+    presigned_url_expiry: int = Field(300, ge=1, description="Seconds a presigned download URL stays valid.")
+    multipart_max_concurrency: int = Field(
+        4,
+        ge=1,
+        description="Maximum number of parts uploaded in parallel. Each upload buffers up to this many parts in memory.",  # noqa: E501
+    )
 
     @model_validator(mode="after")
     def check_endpoint_http(self) -> Self:
@@ -136,11 +174,19 @@ class CookieSettings(BaseModel):
     session_key: str = token_urlsafe(32)
     max_age: int = int(timedelta(weeks=2).total_seconds())
     domain: str = "localhost"
+    secure: bool = Field(
+        True,
+        description="Only send the session cookie over HTTPS (browsers allow it on http://localhost).",
+    )
 
 
 class FrontendSettings(BaseModel):
     cors: CorsSettings = CorsSettings()
     cookie: CookieSettings = CookieSettings()
+    template_auto_reload: bool = Field(
+        False,
+        description="Check templates for changes on every render, only useful when developing templates.",
+    )
 
 
 class AuthSettings(BaseModel):
@@ -182,6 +228,7 @@ class AppSettings(BaseSettings):
         description="Must include the database name.",
         examples=["postgresql://{username}:{password}@{hostname}:{port}/{dbname}"],
     )
+    db_pool: DatabasePoolSettings = DatabasePoolSettings()
 
     auth: AuthSettings = AuthSettings()
     log: LogSettings = LogSettings()
@@ -1,16 +1,52 @@
+import asyncio
 from collections.abc import AsyncGenerator
+from typing import Any
 
-from sqlalchemy import create_engine
+import structlog
+from sqlalchemy import Executable, Result, create_engine
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
 
+log = structlog.stdlib.get_logger("app")
+
 db_url = str(settings.db_uri).replace("postgresql://", "postgresql+psycopg://")
 engine = create_engine(db_url)
-async_engine = create_async_engine(db_url)
+async_engine = create_async_engine(
+    db_url,
+    pool_size=settings.db_pool.size,
+    max_overflow=settings.db_pool.max_overflow,
+    pool_timeout=settings.db_pool.timeout,
+    pool_recycle=settings.db_pool.recycle,
+    pool_pre_ping=settings.db_pool.pre_ping,
+)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession]:
-    async with AsyncSession(async_engine) as session:
+    # Don't expire instances on commit, so attributes that are already loaded don't need to be fetched again
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
         yield session
+
+
+async def execute(session: AsyncSession, statement: Executable) -> Result[Any]:
+    """
+    Execute a statement that `session.exec()` doesn't take, like UPDATE and DELETE with RETURNING.
+
+    SQLModel marks `execute()` as deprecated in favor of `exec()`, so it's only called from here.
+    """
+    return await session.execute(statement)  # type: ignore[deprecated]
+
+
+async def warm_pool() -> None:
+    """Open some of the pool's connections ahead of the first requests."""
+
+    count = min(settings.db_pool.warm, settings.db_pool.size)
+    results = await asyncio.gather(*(async_engine.connect().start() for _ in range(count)), return_exceptions=True)
+    # Closing a connection returns it to the pool, where it stays open
+    await asyncio.gather(*(result.close() for result in results if not isinstance(result, BaseException)))
+
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        # Not fatal, the pool will connect again when a request needs a connection
+        log.warning("Unable to warm up the database pool", failed=len(errors), exc_info=errors[0])
@@ -16,3 +16,4 @@ ObjectStoreDep = Annotated[S3Store, Depends(get_object_store)]
 """Get an S3Store instance"""
 
 oidc_provider = Provider(settings.auth.oidc_url)
+"""The OpenID Connect provider, shared by the API and frontend so metadata and keys are only fetched once"""
@@ -0,0 +1,12 @@
+import httpx
+
+http_client = httpx.AsyncClient(
+    timeout=10.0,
+    limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=30.0),
+)
+"""
+Shared HTTP client for outbound requests (e.g. the OIDC provider).
+
+Reusing one client keeps connections alive between requests, instead of a new TCP/TLS handshake
+every time. It's closed by the app lifespan.
+"""
@@ -0,0 +1,15 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered by pydantic-core's Rust serializer instead of the stdlib `json` module.
+
+    Output is compact UTF-8 JSON, the same as Starlette's JSONResponse.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
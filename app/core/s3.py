@@ -1,9 +1,18 @@
+from functools import lru_cache
+
 from obstore.store import S3Store
 
 from app.core.config import settings
 
 
-def get_object_store() -> S3Store:
+@lru_cache(maxsize=1)
+def create_object_store() -> S3Store:
+    """
+    Create the S3Store, only once.
+
+    The store holds the HTTP connection pool and resolved credentials, so reusing it avoids a new
+    TLS handshake for every request. It's created on first use, after the settings have been loaded.
+    """
     return S3Store(
         settings.s3.bucket_name,
         prefix=settings.s3.path_prefix,
@@ -15,3 +24,8 @@ def get_object_store() -> S3Store:
             "allow_invalid_certificates": settings.s3.allow_invalid_certificates,
         },
     )
+
+
+async def get_object_store() -> S3Store:
+    # Async, so FastAPI calls it directly instead of in the threadpool
+    return create_object_store()
@@ -2,6 +2,7 @@ from importlib.metadata import metadata
 
 import structlog
 from opentelemetry import metrics, trace
+from opentelemetry.exporter.otlp.proto.http import Compression
 from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
 from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
 from opentelemetry.exporter.prometheus import PrometheusMetricReader
@@ -13,15 +14,28 @@ from opentelemetry.sdk.metrics import MeterProvider, TraceBasedExemplarFilter
 from opentelemetry.sdk.metrics.export import MetricReader, PeriodicExportingMetricReader
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
-from opentelemetry.sdk.trace.sampling import ALWAYS_ON, ParentBased
-from prometheus_client import start_http_server
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter, SpanExporter
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from prometheus_client import disable_created_metrics, start_http_server
 
 from app.core.config import settings
+from app.core.db import async_engine, engine
 
 log = structlog.stdlib.get_logger("telemetry")
 
 
+def batch_span_processor(exporter: SpanExporter) -> BatchSpanProcessor:
+    # Every request emits several spans (HTTP, DB, HTTPX, Jinja2, S3), the SDK defaults (2048 span queue, 512 span
+    # batches) drop spans under load and wake the exporter thread too often
+    return BatchSpanProcessor(
+        exporter,
+        max_queue_size=8192,
+        max_export_batch_size=1024,
+        schedule_delay_millis=2000,
+        export_timeout_millis=30000,
+    )
+
+
 def setup_telemetry() -> bool:
     if not (
         settings.telemetry.otel_endpoint
@@ -37,15 +51,20 @@ def setup_telemetry() -> bool:
 
     resource = Resource(attributes={"service.name": "atlas", "service.version": project_metadata["Version"]})
 
-    provider = TracerProvider(sampler=ParentBased(ALWAYS_ON), resource=resource)
+    provider = TracerProvider(
+        sampler=ParentBased(TraceIdRatioBased(settings.telemetry.sample_ratio)),
+        resource=resource,
+    )
 
     if settings.telemetry.otel_endpoint:
-        processor = BatchSpanProcessor(OTLPSpanExporter(endpoint=str(settings.telemetry.otel_endpoint)))
+        processor = batch_span_processor(
+            OTLPSpanExporter(endpoint=str(settings.telemetry.otel_endpoint), compression=Compression.Gzip)
+        )
         provider.add_span_processor(processor)
         log.info("Sending traces to OTLP endpoint", endpoint=str(settings.telemetry.otel_endpoint))
     if settings.telemetry.console:
         # TODO: Use a formatter to make the spans look better
-        processor = BatchSpanProcessor(ConsoleSpanExporter())
+        processor = batch_span_processor(ConsoleSpanExporter())
         provider.add_span_processor(processor)
         log.info("Dumping traces to console")
 
@@ -55,18 +74,23 @@ def setup_telemetry() -> bool:
     # Instrument requests made by HTTPX
     HTTPXClientInstrumentor().instrument()
 
-    # Instrument SQLAlchemy
-    SQLAlchemyInstrumentor().instrument(enable_commenter=True)
+    # Instrument SQLAlchemy, the engines already exist (instrument() only patches engines created after it's called).
+    # Besides query spans this reports the pool's connection usage, to see if db_pool.size fits the load.
+    SQLAlchemyInstrumentor().instrument(engines=[engine, async_engine.sync_engine], enable_commenter=True)
 
-    # Instrument Jinja2
-    Jinja2Instrumentor().instrument()
+    # These only produce/propagate spans, don't wrap every template render and thread when traces aren't exported
+    if settings.telemetry.otel_endpoint or settings.telemetry.console:
+        # Instrument Jinja2
+        Jinja2Instrumentor().instrument()
 
-    # Propagate OpenTelemetry context across threads
-    ThreadingInstrumentor().instrument()
+        # Propagate OpenTelemetry context across threads
+        ThreadingInstrumentor().instrument()
 
     metric_readers: list[MetricReader] = []
 
     if settings.metrics.prometheus.host:
+        # The *_created series are rarely used, skipping them shrinks every scrape the exporter thread serializes
+        disable_created_metrics()  # type: ignore[no-untyped-call]
         start_http_server(port=settings.metrics.prometheus.port, addr=settings.metrics.prometheus.host)
         log.info(
             f"Metrics available at http://{settings.metrics.prometheus.host}:{settings.metrics.prometheus.port}/metrics"
@@ -75,7 +99,9 @@ def setup_telemetry() -> bool:
 
     if settings.metrics.otel_endpoint:
         metric_readers.append(
-            PeriodicExportingMetricReader(OTLPMetricExporter(endpoint=str(settings.metrics.otel_endpoint)))
+            PeriodicExportingMetricReader(
+                OTLPMetricExporter(endpoint=str(settings.metrics.otel_endpoint), compression=Compression.Gzip)
+            )
         )
         log.info("Sending metrics to OTLP endpoint", endpoint=str(settings.metrics.otel_endpoint))
 
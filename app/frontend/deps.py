@@ -1,20 +1,31 @@
+import uuid
 from pathlib import Path
 from typing import Annotated
 
+import jinja2
 import structlog
 from fastapi import Cookie, Depends, HTTPException, status
 from fastapi.templating import Jinja2Templates
 from opentelemetry import trace
-from sqlalchemy.exc import NoResultFound
-from sqlmodel import select
+from sqlalchemy.orm import joinedload
+from sqlmodel import col, func, select
 
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.deps import DatabaseDep
 from app.models.session import Session
 from app.models.user import User
 
 log = structlog.stdlib.get_logger("frontend")
 
-templates = Jinja2Templates(directory=Path(__file__).parent.joinpath("templates"))
+# Compiled templates are cached in memory, without auto reload they aren't stat'ed on every render
+templates = Jinja2Templates(
+    env=jinja2.Environment(
+        loader=jinja2.FileSystemLoader(Path(__file__).parent.joinpath("templates")),
+        autoescape=True,
+        auto_reload=settings.frontend.template_auto_reload,
+    )
+)
 
 
 async def get_templates() -> Jinja2Templates:
@@ -24,6 +35,11 @@ async def get_templates() -> Jinja2Templates:
 TemplatesDep = Annotated[Jinja2Templates, Depends(get_templates)]
 """Get a jinja template instance"""
 
+# Every page load needs the session and its user, cache them briefly to skip both queries.
+# Entries for a session must be dropped whenever it's changed (e.g. login and logout).
+session_cache: TTLCache[uuid.UUID, Session] = TTLCache(maxsize=4096, ttl=10)
+user_cache: TTLCache[int, User] = TTLCache(maxsize=4096, ttl=30)
+
 
 async def get_session(db: DatabaseDep, session_token: Annotated[str | None, Cookie()] = None) -> Session:
     if session_token is None:
@@ -31,19 +47,41 @@ async def get_session(db: DatabaseDep, session_token: Annotated[str | None, Cook
         return Session()
 
     try:
-        result = await db.exec(select(Session).where(Session.token == session_token))
-        session: Session = result.one()
-    except NoResultFound:
-        log.debug("Unknown session token", session_token=session_token)
+        token = uuid.UUID(session_token)
+    except ValueError:
+        log.debug("Malformed session token", session_token=session_token)
         return Session()
 
-    log.debug("Session found", session_token=session.token)
-    if session.is_active():
-        log.debug("Session active", session_token=session.token)
-        return session
+    cached = session_cache.get(token)
+    if cached is not None:
+        if cached.is_active():
+            log.debug("Session active (cached)", session_token=cached.token)
+            # Copy the cached instance into this request's db session, without querying for it again
+            return await db.merge(cached, load=False)
+        session_cache.pop(token)
+        return Session()
 
-    log.debug("Session is not active", session_token=session.token)
-    return Session()
+    # The token is the primary key, so this is a single index probe. Expired and logged out sessions are
+    # filtered out by the database, there's no difference between them and an unknown token here.
+    # The user is joined in the same query, so get_current_user finds it in the identity map. The user's other
+    # sessions aren't needed, don't let them be selectin loaded along with it.
+    statement = (
+        select(Session)
+        .where(
+            Session.token == token,
+            col(Session.expires_at) > func.now(),
+            col(Session.logged_out_at).is_(None),
+        )
+        .options(joinedload(Session.user).raiseload(User.sessions))  # type: ignore[arg-type]
+    )
+    session = (await db.exec(statement)).first()
+    if session is None:
+        log.debug("No active session for token", session_token=session_token)
+        return Session()
+
+    log.debug("Session active", session_token=session.token)
+    session_cache.set(token, session)
+    return session
 
 
 SessionDep = Annotated[Session, Depends(get_session)]
@@ -55,18 +93,20 @@ async def get_current_user(db: DatabaseDep, session: SessionDep) -> User:
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated",
         )
-    try:
-        result = await db.exec(select(User).where(User.id == session.user_id))
-        user = result.one()
-    except NoResultFound as exc:
-        log.warn(
-            "Active session, but the user doesn't exist!",
-            session_token=session.token,
-            user_id=session.user_id,
-        )
-        raise HTTPException(status_code=500, detail="An unexpected error occurred.") from exc
+    user = user_cache.get(session.user_id)
+    if user is None:
+        # Already loaded with the session, this doesn't query the database
+        user = await db.get(User, session.user_id)
+        if user is None:
+            log.warn(
+                "Active session, but the user doesn't exist!",
+                session_token=session.token,
+                user_id=session.user_id,
+            )
+            raise HTTPException(status_code=500, detail="An unexpected error occurred.")
+        log.debug("User found in DB", user=user)
+        user_cache.set(session.user_id, user)
 
-    log.debug("User found in DB", user=user)
     structlog.contextvars.bind_contextvars(user_id=user.id)
     current_span = trace.get_current_span()
     # ref: https://opentelemetry.io/docs/specs/semconv/attributes-registry/enduser/#end-user-attributes
@@ -3,26 +3,29 @@ from pathlib import Path
 from typing import Annotated, Any
 from urllib.parse import urlencode
 
-import httpx
 import structlog
 from fastapi import FastAPI, Form, HTTPException, Request, status
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
+from pydantic_core import from_json
 from sqlalchemy.exc import NoResultFound
-from sqlmodel import select
+from sqlmodel import func, select
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.middleware.sessions import SessionMiddleware
 
+from app.auth.oidc import ProviderMetadata
 from app.core.config import settings
 from app.core.deps import DatabaseDep, oidc_provider
-from app.frontend.deps import CurrentUser, SessionDep, TemplatesDep, templates
+from app.core.http import http_client
+from app.core.responses import FastJSONResponse
+from app.frontend.deps import CurrentUser, SessionDep, TemplatesDep, session_cache, templates
 from app.models.session import Session
 from app.models.user import User
 
 log = structlog.stdlib.get_logger("frontend")
 
 
-frontend_app = FastAPI()
+frontend_app = FastAPI(default_response_class=FastJSONResponse)
 
 
 @frontend_app.exception_handler(StarletteHTTPException)
@@ -44,18 +47,24 @@ async def index(request: Request, templates: TemplatesDep) -> Any:
     return templates.TemplateResponse(request, name="index.jinja", context={})
 
 
-@frontend_app.get("/login")
-async def login(request: Request, db: DatabaseDep) -> Any:
-    provider_info = await oidc_provider.get_metadata()
+required_auth_support = [
+    ("response_types_supported", "code"),
+    ("response_modes_supported", "form_post"),
+    ("grant_types_supported", "authorization_code"),
+    ("subject_types_supported", "public"),
+    ("token_endpoint_auth_methods_supported", "client_secret_post"),
+    # TODO: check for backchannel_logout_supported=True and backchannel_logout_session_supported=True
+]
+
+# The provider metadata is cached, so it only needs to be checked when a new document has been fetched
+supported_provider_info: ProviderMetadata | None = None
+
 
-    required_auth_support = [
-        ("response_types_supported", "code"),
-        ("response_modes_supported", "form_post"),
-        ("grant_types_supported", "authorization_code"),
-        ("subject_types_supported", "public"),
-        ("token_endpoint_auth_methods_supported", "client_secret_post"),
-        # TODO: check for backchannel_logout_supported=True and backchannel_logout_session_supported=True
-    ]
+def check_auth_support(provider_info: ProviderMetadata) -> None:
+    """Make sure the authentication provider supports the flow used to log in."""
+    global supported_provider_info
+    if provider_info is supported_provider_info:
+        return
 
     for parameter, required_value in required_auth_support:
         supported_values = getattr(provider_info, parameter)
@@ -70,12 +79,20 @@ async def login(request: Request, db: DatabaseDep) -> Any:
                 detail=message,
             )
 
+    supported_provider_info = provider_info
+
+
+@frontend_app.get("/login")
+async def login(request: Request, db: DatabaseDep) -> Any:
+    provider_info = await oidc_provider.get_metadata()
+    check_auth_support(provider_info)
+
     session = Session(
         expires_at=datetime.datetime.now(tz=datetime.UTC) + datetime.timedelta(seconds=settings.frontend.cookie.max_age)
     )
     db.add(session)
+    # The token, state and nonce are generated in Python, so there's nothing to refresh before they're used
     await db.commit()
-    await db.refresh(session)
     log.debug("Session created", session_token=session.token)
 
     query_parameters = urlencode(
@@ -94,7 +111,12 @@ async def login(request: Request, db: DatabaseDep) -> Any:
 
     # set session cookie
     response.set_cookie(
-        key="session_token", value=str(session.token), max_age=settings.frontend.cookie.max_age, httponly=True
+        key="session_token",
+        value=str(session.token),
+        max_age=settings.frontend.cookie.max_age,
+        httponly=True,
+        secure=settings.frontend.cookie.secure,
+        samesite="lax",
     )
 
     return response
@@ -104,9 +126,12 @@ async def get_session_from_state(db: DatabaseDep, state: str) -> Session:
     try:
         result = await db.exec(select(Session).where(Session.auth_state == state))
         session: Session = result.one()
-    except NoResultFound:
+    except NoResultFound as exc:
         log.debug("Unknown session auth_state", session_auth_state=state)
-        return Session()
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session is not active",
+        ) from exc
 
     log.debug("Session found", session_token=session.token)
     if not session.is_active():
@@ -134,7 +159,7 @@ async def auth(
     request: Request,
     db: DatabaseDep,
 ) -> Any:
-    log.info("auth response received", auth_code=code, auth_state=state)
+    log.debug("auth response received", auth_code=code, auth_state=state)
 
     session = await get_session_from_state(db, state)
 
@@ -142,28 +167,27 @@ async def auth(
 
     # use code to get id_token (and maybe access_token?)
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            token_response = await client.post(
-                str(provider_info.token_endpoint),
-                data={
-                    "grant_type": "authorization_code",
-                    "code": code,
-                    "redirect_uri": request.url_for("auth"),
-                    "client_id": settings.auth.client_id,
-                    "client_secret": settings.auth.client_secret,
-                },
-            )
-            token_response.raise_for_status()
-            tokens = token_response.json()
-            # TODO: fully validate id_token (https://openid.net/specs/openid-connect-core-1_0.html#IDTokenValidation)
-            userinfo = await oidc_provider.decode_token(tokens["id_token"], nonce=session.auth_nonce)
+        token_response = await http_client.post(
+            str(provider_info.token_endpoint),
+            data={
+                "grant_type": "authorization_code",
+                "code": code,
+                "redirect_uri": request.url_for("auth"),
+                "client_id": settings.auth.client_id,
+                "client_secret": settings.auth.client_secret,
+            },
+        )
+        token_response.raise_for_status()
+        tokens = from_json(token_response.content)
+        # TODO: fully validate id_token (https://openid.net/specs/openid-connect-core-1_0.html#IDTokenValidation)
+        userinfo = await oidc_provider.decode_token(tokens["id_token"], nonce=session.auth_nonce)
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch id token from provider.",
         ) from exc
 
-    log.info("userinfo", userinfo=userinfo)
+    log.debug("userinfo", userinfo=userinfo)
     if not userinfo:
         log.debug("Failed to fetch userinfo")
         raise HTTPException(
@@ -183,12 +207,13 @@ async def auth(
         await db.commit()
         await db.refresh(user_create)
         log.debug("User created", user=user_create)
-        user = User.model_validate(user_create)
+        user = user_create
 
+    # The session is already in the db session, committing sends a single UPDATE. No refresh, nothing else is used.
     session.user_id = user.id
-    db.add(session)
     await db.commit()
-    await db.refresh(session)
+    # The session may have been cached before login, without a user
+    session_cache.pop(session.token)
     log.debug("User login successful", user_id=user.id)
 
     return RedirectResponse(url=request.url_for("index"), status_code=status.HTTP_303_SEE_OTHER)
@@ -198,15 +223,14 @@ async def auth(
 async def logout(session: SessionDep, db: DatabaseDep) -> RedirectResponse:
     if session:
         # if session is still active
-        session.logged_out_at = datetime.datetime.now(tz=datetime.UTC)
-        session.updated_at = datetime.datetime.now(tz=datetime.UTC)
-        db.add(session)
+        session_cache.pop(session.token)
+        # Let the database set the time, updated_at is set by its onupdate default
+        session.logged_out_at = func.now()  # type: ignore[assignment]
         await db.commit()
-        await db.refresh(session)
 
     response = RedirectResponse(url="/")
     # delete session cookie
-    response.delete_cookie(key="session_token", httponly=True)
+    response.delete_cookie(key="session_token", httponly=True, secure=settings.frontend.cookie.secure, samesite="lax")
 
     return response
 
@@ -3,15 +3,17 @@ from contextlib import asynccontextmanager
 from importlib.metadata import metadata
 
 from fastapi import FastAPI
-from fastapi_pagination import add_pagination
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 from sqlalchemy.exc import DBAPIError, SQLAlchemyError
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
 from app.core.config import settings
+from app.core.db import warm_pool
 from app.core.exceptions import dbapi_exception_handler, sqlalchemy_exception_handler
+from app.core.http import http_client
 from app.core.logging import setup_logging
+from app.core.responses import FastJSONResponse
 from app.core.telemetry import setup_telemetry
 from app.frontend.main import frontend_app
 from app.utils import generate_unique_route_id
@@ -24,8 +26,10 @@ setup_logging()
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
     # run before app start-up
+    await warm_pool()
     yield
-    # run after app start-up
+    # run after app shutdown
+    await http_client.aclose()
 
 
 app = FastAPI(
@@ -41,6 +45,7 @@ app = FastAPI(
     },
     swagger_ui_parameters={"tryItOutEnabled": True, "persistAuthorization": True},
     generate_unique_id_function=generate_unique_route_id,
+    default_response_class=FastJSONResponse,
     exception_handlers={
         DBAPIError: dbapi_exception_handler,
         SQLAlchemyError: sqlalchemy_exception_handler,
@@ -55,7 +60,6 @@ app.add_middleware(
     allow_methods=settings.api.cors.allow_methods,
     allow_headers=settings.api.cors.allow_headers,
 )
-add_pagination(app)
 
 if setup_telemetry():
     FastAPIInstrumentor.instrument_app(app)
@@ -1,5 +1,9 @@
 from sqlmodel import SQLModel
 
+# Relationships are resolved by class name when the mappers are configured, which happens as soon as a loader
+# option (e.g. joinedload) is built at import time. Import every model first, so each name can be found.
+from . import attachment, collection, item, room, session, stack, tag, user
+
 # We list all the models here so that Alembic's autogenerate works.
 # Used by "from app.models import *" in app/alembic/env.py
 __all__ = ["attachment", "collection", "item", "room", "session", "stack", "tag", "user"]
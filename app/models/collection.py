@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlmodel import Column, DateTime, Field, Identity, Relationship, SQLModel, func
+from sqlmodel import Column, DateTime, Field, Identity, Index, Relationship, SQLModel, func
 
 if TYPE_CHECKING:
     from .item import Item
@@ -31,6 +31,16 @@ class CollectionUpdate(CollectionBase):
 class Collection(CollectionBase, table=True):
     """Database model, database table inferred from class name"""
 
+    # Fetch server generated values (created_at, updated_at) with RETURNING as part of the INSERT/UPDATE
+    __mapper_args__ = {"eager_defaults": True}
+
+    # Indexes for each sort order of the list endpoint, the id makes them usable for keyset pagination
+    __table_args__ = (
+        Index("ix_collection_created_at_id", "created_at", "id"),
+        Index("ix_collection_updated_at_id", "updated_at", "id"),
+        Index("ix_collection_title_id", "title", "id"),
+    )
+
     id: int | None = Field(default=None, primary_key=True, sa_column_args=[Identity(always=True)])
     """id will be generated by the database"""
     created_at: datetime | None = Field(
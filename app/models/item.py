@@ -5,7 +5,7 @@ from typing import Annotated, Any
 import structlog
 from pydantic import AfterValidator, ValidationInfo
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlmodel import Column, DateTime, Field, Identity, Relationship, SQLModel, func
+from sqlmodel import Column, DateTime, Field, Identity, Index, Relationship, SQLModel, func
 
 from .attachment import Attachment, AttachmentPublic
 from .collection import Collection, CollectionPublic
@@ -60,6 +60,19 @@ class ItemUpdate(ItemBase):
 class Item(ItemBase, table=True):
     """Database model, database table inferred from class name"""
 
+    # Fetch server generated values (created_at, updated_at) with RETURNING as part of the INSERT/UPDATE
+    __mapper_args__ = {"eager_defaults": True}
+
+    # Indexes for each sort order of the list endpoint, the id makes them usable for keyset pagination
+    __table_args__ = (
+        Index("ix_item_created_at_id", "created_at", "id"),
+        Index("ix_item_updated_at_id", "updated_at", "id"),
+        Index("ix_item_title_id", "title", "id"),
+        # Filtering by collection/stack, the stack index is also in the stack sort's shelf and slot order
+        Index("ix_item_collection_id", "collection_id"),
+        Index("ix_item_stack_id_shelf_slot_id", "stack_id", "shelf", "slot", "id"),
+    )
+
     id: int | None = Field(default=None, primary_key=True, sa_column_args=[Identity(always=True)])
     """id will be generated by the database"""
     created_at: datetime | None = Field(
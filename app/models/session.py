@@ -13,7 +13,8 @@ log = structlog.stdlib.get_logger("models")
 
 
 def generate_token_urlsafe() -> str:
-    return secrets.token_urlsafe(64)
+    # 48 random bytes (384 bits) is plenty for the auth state and nonce
+    return secrets.token_urlsafe(48)
 
 
 class Session(SQLModel, table=True):
@@ -41,9 +42,11 @@ class Session(SQLModel, table=True):
 
     user_id: int | None = Field(None, foreign_key="user.id")
     data: dict[str, Any] = Field({}, nullable=False, sa_type=JSONB)
+    # Sessions are looked up on every request and the user is fetched separately (and cached), so don't load it
+    # by default. Use selectinload(Session.user) in queries that need it.
     user: User | None = Relationship(
         back_populates="sessions",
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
 
     def is_active(self) -> bool:
@@ -7,6 +7,7 @@ from sqlmodel import (
     DateTime,
     Field,
     Identity,
+    Index,
     Relationship,
     SQLModel,
     UniqueConstraint,
@@ -20,7 +21,11 @@ if TYPE_CHECKING:
 class ItemTagLink(SQLModel, table=True):
     """Linking table (many-to-many) for Item and Tag"""
 
-    __table_args__ = (UniqueConstraint("item_id", "tag_id", name="uix_item_tag"),)
+    __table_args__ = (
+        UniqueConstraint("item_id", "tag_id", name="uix_item_tag"),
+        # The primary key starts with item_id, this finds the items with a tag
+        Index("ix_itemtaglink_tag_id_item_id", "tag_id", "item_id"),
+    )
     item_id: int = Field(foreign_key="item.id", primary_key=True)
     tag_id: int = Field(foreign_key="tag.id", primary_key=True)
     created_at: datetime | None = Field(sa_column=Column(DateTime(timezone=True), server_default=func.now()))
@@ -48,6 +53,16 @@ class TagUpdate(TagBase):
 class Tag(TagBase, table=True):
     """Database model, database table inferred from class name"""
 
+    # Fetch server generated values (created_at, updated_at) with RETURNING as part of the INSERT/UPDATE
+    __mapper_args__ = {"eager_defaults": True}
+
+    # Indexes for each sort order of the list endpoint, the id makes them usable for keyset pagination
+    __table_args__ = (
+        Index("ix_tag_created_at_id", "created_at", "id"),
+        Index("ix_tag_updated_at_id", "updated_at", "id"),
+        Index("ix_tag_name_id", "name", "id"),
+    )
+
     id: int | None = Field(default=None, primary_key=True, sa_column_args=[Identity(always=True)])
     """id will be generated by the database"""
     created_at: datetime | None = Field(
@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 
 from pydantic import EmailStr, computed_field
-from sqlmodel import Column, DateTime, Field, Identity, Relationship, SQLModel, func
+from sqlmodel import Column, DateTime, Field, Identity, Index, Relationship, SQLModel, func
 
 if TYPE_CHECKING:
     from .session import Session
@@ -11,7 +11,8 @@ if TYPE_CHECKING:
 class UserBase(SQLModel):
     """Shared properties"""
 
-    email: EmailStr = Field(max_length=255)
+    # Users are looked up by email on every authenticated request
+    email: EmailStr = Field(max_length=255, unique=True, index=True)
     name: str = Field(max_length=255)
     username: str = Field(max_length=255)
 
@@ -31,6 +32,15 @@ class UserUpdate(UserBase):
 class User(UserBase, table=True):
     """Database model, database table inferred from class name"""
 
+    # Indexes for each sort order of the list endpoint, the id makes them usable for keyset pagination
+    __table_args__ = (
+        Index("ix_user_created_at_id", "created_at", "id"),
+        Index("ix_user_updated_at_id", "updated_at", "id"),
+        Index("ix_user_email_id", "email", "id"),
+        Index("ix_user_name_id", "name", "id"),
+        Index("ix_user_username_id", "username", "id"),
+    )
+
     id: int | None = Field(default=None, primary_key=True, sa_column_args=[Identity(always=True)])
     """id will be generated by the database"""
     created_at: datetime | None = Field(
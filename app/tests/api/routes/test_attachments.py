@@ -0,0 +1,139 @@
+import hashlib
+from datetime import timedelta
+from email.utils import format_datetime
+from typing import Any
+
+import obstore
+import pytest
+from fastapi.testclient import TestClient
+from obstore.store import MemoryStore
+from sqlmodel import Session, select
+
+from app.api.routes.attachments import attachment_path
+from app.core.config import settings
+from app.models.attachment import Attachment
+from app.tests.utils.attachment import create_random_attachment
+from app.tests.utils.item import create_random_item
+
+
+def test_create_attachment(client: TestClient, db: Session, object_store: MemoryStore) -> None:
+    item = create_random_item(db)
+    response = client.post(
+        f"/api/items/{item.id}/attachment", files={"file": ("notes.txt", b"attached file", "text/plain")}
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["item_id"] == item.id
+    assert content["filename"] == "notes.txt"
+    assert content["content_type"] == "text/plain"
+    assert content["checksum_sha256"] == hashlib.sha256(b"attached file").hexdigest()
+
+    attachment = db.get(Attachment, content["id"])
+    assert attachment is not None
+    assert bytes(obstore.get(object_store, attachment_path(attachment)).bytes()) == b"attached file"
+
+
+def test_create_attachment_upload_failed(client: TestClient, db: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    item = create_random_item(db)
+
+    async def put_async(*args: Any, **kwargs: Any) -> None:
+        raise ConnectionError("Object store unavailable")
+
+    monkeypatch.setattr(obstore, "put_async", put_async)
+    response = client.post(
+        f"/api/items/{item.id}/attachment", files={"file": ("notes.txt", b"attached file", "text/plain")}
+    )
+    assert response.status_code == 500
+    content = response.json()
+    assert content["detail"] == "Upload failed"
+    # The attachment row was rolled back along with the failed upload
+    assert db.exec(select(Attachment).where(Attachment.item_id == item.id)).all() == []
+
+
+def test_create_attachment_item_not_found(client: TestClient) -> None:
+    response = client.post("/api/items/2147483647/attachment", files={"file": ("notes.txt", b"", "text/plain")})
+    assert response.status_code == 404
+    content = response.json()
+    assert content["detail"] == "Item not found"
+
+
+def test_read_attachment(
+    client: TestClient, db: Session, object_store: MemoryStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings.s3, "presigned_downloads", False)
+    attachment = create_random_attachment(db, create_random_item(db))
+    path = attachment_path(attachment)
+    obstore.put(object_store, path, b"attached file")
+    meta = obstore.head(object_store, path)
+
+    response = client.get(f"/api/items/{attachment.item_id}/attachment/{attachment.id}")
+    assert response.status_code == 200
+    assert response.content == b"attached file"
+    assert response.headers["content-type"].startswith("text/plain")
+    assert response.headers["content-length"] == str(len(b"attached file"))
+    assert response.headers["last-modified"] == format_datetime(meta["last_modified"], usegmt=True)
+    assert response.headers.get("etag") == meta["e_tag"]
+    assert response.headers["content-disposition"].startswith("attachment;")
+
+
+def test_read_attachment_presigned(client: TestClient, db: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings.s3, "presigned_downloads", True)
+    attachment = create_random_attachment(db, create_random_item(db))
+    signed: list[tuple[Any, ...]] = []
+
+    async def sign_async(store: Any, method: str, path: str, expires_in: timedelta) -> str:
+        signed.append((method, path, expires_in))
+        return f"https://bucket.example.com/{path}?signature=abc"
+
+    monkeypatch.setattr(obstore, "sign_async", sign_async)
+    response = client.get(f"/api/items/{attachment.item_id}/attachment/{attachment.id}", follow_redirects=False)
+    assert response.status_code == 307
+    path = attachment_path(attachment)
+    assert response.headers["location"] == f"https://bucket.example.com/{path}?signature=abc"
+    assert signed == [("GET", path, timedelta(seconds=settings.s3.presigned_url_expiry))]
+
+
+def test_read_attachment_missing_object(client: TestClient, db: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings.s3, "presigned_downloads", False)
+    attachment = create_random_attachment(db, create_random_item(db))
+    response = client.get(f"/api/items/{attachment.item_id}/attachment/{attachment.id}")
+    assert response.status_code == 404
+    content = response.json()
+    assert content["detail"] == "Attachment not found in object store"
+
+
+def test_read_attachment_not_found(client: TestClient, db: Session) -> None:
+    item = create_random_item(db)
+    response = client.get(f"/api/items/{item.id}/attachment/2147483647")
+    assert response.status_code == 404
+    content = response.json()
+    assert content["detail"] == "Attachment not found"
+
+
+def test_delete_attachment(client: TestClient, db: Session, object_store: MemoryStore) -> None:
+    attachment = create_random_attachment(db, create_random_item(db))
+    path = attachment_path(attachment)
+    obstore.put(object_store, path, b"attached file")
+
+    response = client.delete(f"/api/items/{attachment.item_id}/attachment/{attachment.id}")
+    assert response.status_code == 200
+    content = response.json()
+    assert content["detail"] == "Attachment deleted successfully"
+    assert db.get(Attachment, attachment.id, populate_existing=True) is None
+    with pytest.raises(FileNotFoundError):
+        obstore.head(object_store, path)
+
+
+def test_delete_attachment_failed(client: TestClient, db: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    attachment = create_random_attachment(db, create_random_item(db))
+
+    async def delete_async(*args: Any, **kwargs: Any) -> None:
+        raise ConnectionError("Object store unavailable")
+
+    monkeypatch.setattr(obstore, "delete_async", delete_async)
+    response = client.delete(f"/api/items/{attachment.item_id}/attachment/{attachment.id}")
+    assert response.status_code == 500
+    content = response.json()
+    assert content["detail"] == "Delete failed"
+    # The file is deleted first, the row is kept so the file isn't orphaned
+    assert db.get(Attachment, attachment.id, populate_existing=True) is not None
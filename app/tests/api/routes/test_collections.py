@@ -0,0 +1,28 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models.collection import Collection
+from app.models.item import Item
+from app.tests.utils.item import create_random_item
+
+
+def test_delete_collection(client: TestClient, db: Session) -> None:
+    item = create_random_item(db)
+    collection_id = item.collection_id
+    response = client.delete(f"/api/collections/{collection_id}")
+    assert response.status_code == 200
+    content = response.json()
+    assert content["detail"] == "Collection deleted successfully"
+    assert db.get(Collection, collection_id, populate_existing=True) is None
+    # The collection's items are kept, without a collection
+    reloaded = db.get(Item, item.id, populate_existing=True)
+    assert reloaded is not None
+    assert reloaded.collection_id is None
+    assert reloaded.stack_id is not None
+
+
+def test_delete_collection_not_found(client: TestClient) -> None:
+    response = client.delete("/api/collections/2147483647")
+    assert response.status_code == 404
+    content = response.json()
+    assert content["detail"] == "Collection not found"
@@ -1,6 +1,14 @@
+from typing import Any
+
+import obstore
+import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlmodel import Session
 
+from app.core.db import async_engine
+from app.models.attachment import Attachment
+from app.tests.utils.attachment import create_random_attachment
 from app.tests.utils.item import create_random_item
 
 
@@ -34,6 +42,23 @@ def test_read_item(client: TestClient, db: Session) -> None:
     assert content["annotations"] == item.annotations
 
 
+def test_read_item_queries(client: TestClient, db: Session) -> None:
+    item = create_random_item(db)
+    queries: list[str] = []
+
+    def count_query(*args: Any) -> None:
+        queries.append(args[2])
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count_query)
+    try:
+        response = client.get(f"/api/items/{item.id}")
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count_query)
+    assert response.status_code == 200
+    # The item joined with its collection and stack, then its tags and attachments
+    assert len(queries) <= 3
+
+
 def test_read_item_not_found(client: TestClient) -> None:
     response = client.get("/items/2147483647")
     assert response.status_code == 404
@@ -114,6 +139,21 @@ def test_delete_item(client: TestClient, db: Session) -> None:
     assert content["detail"] == "Item deleted successfully"
 
 
+def test_delete_item_attachment_missing(client: TestClient, db: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    item = create_random_item(db)
+    attachment = create_random_attachment(db, item)
+
+    async def delete_missing(*args: Any, **kwargs: Any) -> None:
+        raise FileNotFoundError(attachment.id)
+
+    monkeypatch.setattr(obstore, "delete_async", delete_missing)
+    response = client.delete(f"/api/items/{item.id}")
+    assert response.status_code == 200
+    content = response.json()
+    assert content["detail"] == "Item deleted successfully"
+    assert db.get(Attachment, attachment.id, populate_existing=True) is None
+
+
 def test_delete_item_not_found(client: TestClient) -> None:
     response = client.delete("/items/2147483647")
     assert response.status_code == 404
@@ -0,0 +1,125 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models.room import Room
+from app.models.stack import Stack
+from app.tests.utils.room import create_random_room
+from app.tests.utils.stack import create_random_stack
+
+
+def test_read_room_etag(client: TestClient, db: Session) -> None:
+    room = create_random_room(db)
+    response = client.get(f"/api/rooms/{room.id}")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+
+    response = client.get(f"/api/rooms/{room.id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+
+def test_read_room_etag_weak_comparison(client: TestClient, db: Session) -> None:
+    room = create_random_room(db)
+    etag = client.get(f"/api/rooms/{room.id}").headers["etag"]
+
+    # The same tag without the weak prefix still matches
+    response = client.get(f"/api/rooms/{room.id}", headers={"If-None-Match": etag.removeprefix("W/")})
+    assert response.status_code == 304
+    # As does one of a list of tags
+    response = client.get(f"/api/rooms/{room.id}", headers={"If-None-Match": f'W/"other", {etag}'})
+    assert response.status_code == 304
+
+
+def test_read_room_etag_any(client: TestClient, db: Session) -> None:
+    room = create_random_room(db)
+    response = client.get(f"/api/rooms/{room.id}", headers={"If-None-Match": "*"})
+    assert response.status_code == 304
+
+
+def test_read_room_etag_modified(client: TestClient, db: Session) -> None:
+    room = create_random_room(db)
+    etag = client.get(f"/api/rooms/{room.id}").headers["etag"]
+
+    response = client.put(f"/api/rooms/{room.id}", json={"title": "Updated title"})
+    assert response.status_code == 200
+
+    # updated_at changed, so the room is sent again with a new tag
+    response = client.get(f"/api/rooms/{room.id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["title"] == "Updated title"
+    assert response.headers["etag"] != etag
+
+
+def test_read_room_not_found(client: TestClient) -> None:
+    response = client.get("/api/rooms/2147483647", headers={"If-None-Match": "*"})
+    assert response.status_code == 404
+    content = response.json()
+    assert content["detail"] == "Room not found"
+
+
+def test_update_room(client: TestClient, db: Session) -> None:
+    room = create_random_room(db)
+    data = {"title": "Updated title"}
+    response = client.put(f"/api/rooms/{room.id}", json=data)
+    assert response.status_code == 200
+    content = response.json()
+    assert content["id"] == room.id
+    assert content["title"] == data["title"]
+    # Fields that weren't sent are left as they were
+    assert content["annotations"] == room.annotations
+    assert content["updated_at"] is not None
+
+
+def test_update_room_empty(client: TestClient, db: Session) -> None:
+    room = create_random_room(db)
+    response = client.put(f"/api/rooms/{room.id}", json={})
+    assert response.status_code == 200
+    content = response.json()
+    assert content["id"] == room.id
+    assert content["title"] == room.title
+    assert content["annotations"] == room.annotations
+    assert content["updated_at"] is None
+
+
+def test_update_room_not_found(client: TestClient) -> None:
+    response = client.put("/api/rooms/2147483647", json={"title": "Updated title"})
+    assert response.status_code == 404
+    content = response.json()
+    assert content["detail"] == "Room not found"
+
+
+def test_update_room_empty_not_found(client: TestClient) -> None:
+    response = client.put("/api/rooms/2147483647", json={})
+    assert response.status_code == 404
+    content = response.json()
+    assert content["detail"] == "Room not found"
+
+
+def test_delete_room(client: TestClient, db: Session) -> None:
+    stack = create_random_stack(db)
+    room_id = stack.room_id
+    response = client.delete(f"/api/rooms/{room_id}")
+    assert response.status_code == 200
+    content = response.json()
+    assert content["detail"] == "Room deleted successfully"
+    assert db.get(Room, room_id, populate_existing=True) is None
+    # The room's stacks are kept, without a room
+    reloaded = db.get(Stack, stack.id, populate_existing=True)
+    assert reloaded is not None
+    assert reloaded.room_id is None
+
+
+def test_delete_room_empty(client: TestClient, db: Session) -> None:
+    room = create_random_room(db)
+    response = client.delete(f"/api/rooms/{room.id}")
+    assert response.status_code == 200
+    assert db.get(Room, room.id, populate_existing=True) is None
+
+
+def test_delete_room_not_found(client: TestClient) -> None:
+    response = client.delete("/api/rooms/2147483647")
+    assert response.status_code == 404
+    content = response.json()
+    assert content["detail"] == "Room not found"
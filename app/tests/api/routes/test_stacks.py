@@ -0,0 +1,80 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models.item import Item
+from app.models.stack import Stack
+from app.tests.utils.item import create_random_item
+from app.tests.utils.room import create_random_room
+from app.tests.utils.stack import create_random_stack
+
+
+def test_update_stack(client: TestClient, db: Session) -> None:
+    stack = create_random_stack(db)
+    data = {"annotations": {"shelves": 6}}
+    response = client.put(f"/api/stacks/{stack.id}", json=data)
+    assert response.status_code == 200
+    content = response.json()
+    assert content["id"] == stack.id
+    assert content["annotations"] == data["annotations"]
+    # Fields that weren't sent are left as they were
+    assert content["title"] == stack.title
+    assert content["room_id"] == stack.room_id
+    assert content["updated_at"] is not None
+
+
+def test_update_stack_room(client: TestClient, db: Session) -> None:
+    stack = create_random_stack(db)
+    room = create_random_room(db)
+    response = client.put(f"/api/stacks/{stack.id}", json={"room_id": room.id})
+    assert response.status_code == 200
+    content = response.json()
+    assert content["room_id"] == room.id
+    assert content["title"] == stack.title
+
+
+def test_update_stack_empty(client: TestClient, db: Session) -> None:
+    stack = create_random_stack(db)
+    response = client.put(f"/api/stacks/{stack.id}", json={})
+    assert response.status_code == 200
+    content = response.json()
+    assert content["id"] == stack.id
+    assert content["title"] == stack.title
+    assert content["room_id"] == stack.room_id
+    assert content["annotations"] == stack.annotations
+    assert content["updated_at"] is None
+
+
+def test_update_stack_not_found(client: TestClient) -> None:
+    response = client.put("/api/stacks/2147483647", json={"title": "Updated title"})
+    assert response.status_code == 404
+    content = response.json()
+    assert content["detail"] == "Stack not found"
+
+
+def test_update_stack_empty_not_found(client: TestClient) -> None:
+    response = client.put("/api/stacks/2147483647", json={})
+    assert response.status_code == 404
+    content = response.json()
+    assert content["detail"] == "Stack not found"
+
+
+def test_delete_stack(client: TestClient, db: Session) -> None:
+    item = create_random_item(db)
+    stack_id = item.stack_id
+    response = client.delete(f"/api/stacks/{stack_id}")
+    assert response.status_code == 200
+    content = response.json()
+    assert content["detail"] == "Stack deleted successfully"
+    assert db.get(Stack, stack_id, populate_existing=True) is None
+    # The stack's items are kept, without a stack
+    reloaded = db.get(Item, item.id, populate_existing=True)
+    assert reloaded is not None
+    assert reloaded.stack_id is None
+    assert reloaded.collection_id is not None
+
+
+def test_delete_stack_not_found(client: TestClient) -> None:
+    response = client.delete("/api/stacks/2147483647")
+    assert response.status_code == 404
+    content = response.json()
+    assert content["detail"] == "Stack not found"
@@ -0,0 +1,41 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.tests.utils.tag import create_random_tag
+
+
+def test_update_tag(client: TestClient, db: Session) -> None:
+    tag = create_random_tag(db)
+    data = {"name": "Updated name"}
+    response = client.put(f"/api/tags/{tag.id}", json=data)
+    assert response.status_code == 200
+    content = response.json()
+    assert content["id"] == tag.id
+    assert content["name"] == data["name"]
+    assert content["description"] == tag.description
+    assert content["updated_at"] is not None
+
+
+def test_update_tag_empty(client: TestClient, db: Session) -> None:
+    tag = create_random_tag(db)
+    response = client.put(f"/api/tags/{tag.id}", json={})
+    assert response.status_code == 200
+    content = response.json()
+    assert content["id"] == tag.id
+    assert content["name"] == tag.name
+    assert content["description"] == tag.description
+    assert content["updated_at"] is None
+
+
+def test_update_tag_not_found(client: TestClient) -> None:
+    response = client.put("/api/tags/2147483647", json={"name": "Updated name"})
+    assert response.status_code == 404
+    content = response.json()
+    assert content["detail"] == "Tag not found"
+
+
+def test_update_tag_empty_not_found(client: TestClient) -> None:
+    response = client.put("/api/tags/2147483647", json={})
+    assert response.status_code == 404
+    content = response.json()
+    assert content["detail"] == "Tag not found"
@@ -0,0 +1,55 @@
+import asyncio
+import datetime
+from typing import Any
+
+import pytest
+from fastapi import HTTPException
+from jwt.exceptions import ExpiredSignatureError
+
+from app.api.deps import get_token_payload, token_cache
+from app.core.deps import oidc_provider
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_cache_expiry(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = Clock()
+    monkeypatch.setattr("app.core.cache.time.monotonic", clock)
+    token_cache.clear()
+
+    now = datetime.datetime.now(tz=datetime.UTC).timestamp()
+    decoded: list[str] = []
+
+    async def decode_token(token: str, **kwargs: Any) -> dict[str, Any]:
+        decoded.append(token)
+        if len(decoded) > 1:
+            # The provider's check of the exp claim
+            raise ExpiredSignatureError("Signature has expired")
+        return {
+            "iss": "https://authentik/application/o/atlas/",
+            "sub": "testuser",
+            "aud": "atlas",
+            "exp": now + 5,
+            "iat": now - 3600,
+        }
+
+    monkeypatch.setattr(oidc_provider, "decode_token", decode_token)
+
+    # The token is only valid for another 5 seconds, well short of the cache's TTL
+    assert asyncio.run(get_token_payload("Bearer access-token")).sub == "testuser"
+    clock.now += 4
+    assert asyncio.run(get_token_payload("Bearer access-token")).sub == "testuser"
+    assert decoded == ["access-token"]
+
+    # Past its expiry, the token is validated again rather than accepted from the cache
+    clock.now += 2
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(get_token_payload("Bearer access-token"))
+    assert exc_info.value.status_code == 403
+    assert decoded == ["access-token", "access-token"]
@@ -0,0 +1,225 @@
+import base64
+import datetime
+from collections.abc import Callable
+from typing import Any, cast
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic_core import to_json
+from sqlalchemy import DateTime, Integer
+from sqlalchemy.orm import InstrumentedAttribute, Mapped
+from sqlmodel import Session, SQLModel, col, func, select
+
+from app.api.pagination import _decode_cursor, _encode_cursor
+from app.api.routes.collections import collection_keysets
+from app.api.routes.items import item_keysets
+from app.api.routes.rooms import room_keysets
+from app.api.routes.stacks import stack_keysets
+from app.api.routes.tags import tag_keysets
+from app.api.routes.users import user_keysets
+from app.models.collection import Collection
+from app.models.item import Item
+from app.models.room import Room
+from app.models.stack import Stack
+from app.models.tag import Tag
+from app.models.user import User
+from app.tests.utils.collection import create_random_collection
+from app.tests.utils.item import create_random_item
+from app.tests.utils.room import create_random_room
+from app.tests.utils.stack import create_random_stack
+from app.tests.utils.tag import create_random_tag
+from app.tests.utils.user import create_random_user
+
+# url, model, sorts, create a row, the column to change so a row gets an updated_at
+endpoints: dict[str, tuple[type[SQLModel], list[str], Callable[[Session], Any], str]] = {
+    "/api/collections/": (Collection, ["created_at", "updated_at", "title", "id"], create_random_collection, "title"),
+    "/api/items/": (
+        Item,
+        ["created_at", "updated_at", "title", "collection", "stack", "id"],
+        create_random_item,
+        "title",
+    ),
+    "/api/rooms/": (Room, ["created_at", "updated_at", "title", "id"], create_random_room, "title"),
+    "/api/stacks/": (Stack, ["created_at", "updated_at", "title", "room", "id"], create_random_stack, "title"),
+    "/api/tags/": (Tag, ["created_at", "updated_at", "name", "id"], create_random_tag, "name"),
+    "/api/users/": (
+        User,
+        ["created_at", "updated_at", "email", "name", "username", "id"],
+        create_random_user,
+        "name",
+    ),
+}
+
+sort_cases = [
+    (url, sort, order) for url, (_, sorts, _, _) in endpoints.items() for sort in sorts for order in ("asc", "desc")
+]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def rows(db: Session) -> None:
+    # Enough rows for a few pages, with some of them updated so updated_at has both NULL and non-NULL values
+    for _, _, create, column in endpoints.values():
+        for i in range(5):
+            row = create(db)
+            if i % 2:
+                setattr(row, column, f"{getattr(row, column)} updated")
+                db.add(row)
+                db.commit()
+
+
+def walk(client: TestClient, url: str, sort: str, order: str, size: int) -> list[dict[str, Any]]:
+    """Follow the cursors from the first page to the last, returning every item."""
+    items: list[dict[str, Any]] = []
+    params: dict[str, Any] = {"sort": sort, "order": order, "size": size}
+    while True:
+        response = client.get(url, params=params)
+        assert response.status_code == 200
+        content = response.json()
+        assert len(content["items"]) <= size
+        items += content["items"]
+        if content["next_cursor"] is None:
+            return items
+        # A page is only followed by another if it's full
+        assert len(content["items"]) == size
+        params["cursor"] = content["next_cursor"]
+
+
+def sort_key(item: dict[str, Any], sort: str) -> tuple[bool, Any, int]:
+    """The position of the item when sorted ascending, Postgres sorts NULLs after every other value."""
+    if sort == "id":
+        return (False, item["id"], item["id"])
+    value = item[sort]
+    if value is None:
+        return (True, datetime.datetime.min.replace(tzinfo=datetime.UTC), item["id"])
+    return (False, datetime.datetime.fromisoformat(value), item["id"])
+
+
+@pytest.mark.parametrize(("url", "sort", "order"), sort_cases)
+def test_paginate_every_row_once(client: TestClient, db: Session, url: str, sort: str, order: str) -> None:
+    model = endpoints[url][0]
+    total = db.exec(select(func.count()).select_from(model)).one()
+
+    items = walk(client, url, sort, order, size=2)
+    ids = [item["id"] for item in items]
+    assert len(ids) == len(set(ids))
+    assert len(ids) == total
+    # Small pages are the same rows, in the same order, as a single large page
+    assert ids == [item["id"] for item in walk(client, url, sort, order, size=100)]
+
+
+@pytest.mark.parametrize(
+    ("url", "sort", "order"),
+    [case for case in sort_cases if case[1] in ("created_at", "updated_at", "id")],
+)
+def test_paginate_order(client: TestClient, url: str, sort: str, order: str) -> None:
+    keys = [sort_key(item, sort) for item in walk(client, url, sort, order, size=2)]
+    assert keys == sorted(keys, reverse=order == "desc")
+
+
+@pytest.mark.parametrize("url", endpoints)
+def test_paginate_updated_at_nulls(client: TestClient, url: str) -> None:
+    # NULLs are last in ascending order and first in descending order
+    ascending = [item["updated_at"] for item in walk(client, url, "updated_at", "asc", size=2)]
+    assert None in ascending
+    assert ascending[-1] is None
+    assert ascending[0] is not None
+    descending = [item["updated_at"] for item in walk(client, url, "updated_at", "desc", size=2)]
+    assert descending[0] is None
+    assert descending[-1] is not None
+
+
+@pytest.mark.parametrize("url", endpoints)
+def test_paginate_last_page(client: TestClient, db: Session, url: str) -> None:
+    total = db.exec(select(func.count()).select_from(endpoints[url][0])).one()
+    response = client.get(url, params={"size": total})
+    assert response.status_code == 200
+    content = response.json()
+    assert len(content["items"]) == total
+    assert content["next_cursor"] is None
+
+
+@pytest.mark.parametrize("url", endpoints)
+@pytest.mark.parametrize(
+    ("sort", "cursor"),
+    [
+        ("created_at", "not-a-cursor"),
+        ("created_at", "%%%%"),
+        ("created_at", base64.urlsafe_b64encode(b"not json").decode()),
+        ("created_at", base64.urlsafe_b64encode(to_json({"id": 1})).decode()),
+        ("created_at", base64.urlsafe_b64encode(to_json([1, 2, 3])).decode()),
+        ("created_at", base64.urlsafe_b64encode(to_json(["not a date", 1])).decode()),
+    ],
+)
+def test_paginate_malformed_cursor(client: TestClient, url: str, sort: str, cursor: str) -> None:
+    response = client.get(url, params={"sort": sort, "cursor": cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+@pytest.mark.parametrize("url", endpoints)
+def test_paginate_cursor_from_another_sort(client: TestClient, url: str) -> None:
+    response = client.get(url, params={"sort": "created_at", "size": 1})
+    cursor = response.json()["next_cursor"]
+    assert cursor is not None
+
+    response = client.get(url, params={"sort": "id", "cursor": cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_paginate_string_sort_second_page(client: TestClient, order: str) -> None:
+    url = "/api/collections/"
+    first = client.get(url, params={"sort": "title", "order": order, "size": 1}).json()
+    assert first["next_cursor"] is not None
+
+    response = client.get(url, params={"sort": "title", "order": order, "size": 1, "cursor": first["next_cursor"]})
+    assert response.status_code == 200
+    second = response.json()
+    assert len(second["items"]) == 1
+    assert second["items"][0]["id"] != first["items"][0]["id"]
+
+
+def test_cursor_round_trip() -> None:
+    keyset = [col(Room.created_at), col(Room.title), col(Room.id)]
+    values = [datetime.datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.UTC), "title", 42]
+    assert _decode_cursor(_encode_cursor(values), keyset) == values
+
+
+def test_cursor_round_trip_null() -> None:
+    keyset = [col(Room.updated_at), col(Room.id)]
+    values = [None, 42]
+    assert _decode_cursor(_encode_cursor(values), keyset) == values
+
+
+def test_cursor_round_trip_string() -> None:
+    # Only datetime columns are parsed, a string that looks like a date is left as it is
+    keyset = [col(Room.title), col(Room.id)]
+    values = ["2025-01-02T03:04:05+00:00", 42]
+    assert _decode_cursor(_encode_cursor(values), keyset) == values
+
+
+keysets: dict[str, dict[str, list[Mapped[Any]]]] = {
+    "collections": collection_keysets,
+    "items": item_keysets,
+    "rooms": room_keysets,
+    "stacks": stack_keysets,
+    "tags": tag_keysets,
+    "users": user_keysets,
+}
+
+
+def sample_value(column: Mapped[Any]) -> Any:
+    column_type = cast(InstrumentedAttribute[Any], column).expression.type
+    if isinstance(column_type, DateTime):
+        return datetime.datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.UTC)
+    if isinstance(column_type, Integer):
+        return 42
+    return "title"
+
+
+@pytest.mark.parametrize(("name", "sort"), [(name, sort) for name, sorts in keysets.items() for sort in sorts])
+def test_cursor_round_trip_keysets(name: str, sort: str) -> None:
+    keyset = keysets[name][sort]
+    values = [sample_value(column) for column in keyset]
+    assert _decode_cursor(_encode_cursor(values), keyset) == values
@@ -3,17 +3,21 @@ from collections.abc import Generator
 
 import pytest
 from fastapi.testclient import TestClient
+from obstore.store import MemoryStore
 from sqlmodel import Session, delete
 
 from app.api.deps import get_current_user, get_token_payload
 from app.auth.oidc import TokenPayload
 from app.core.db import engine
+from app.core.s3 import get_object_store
 from app.main import app
 from app.models.attachment import Attachment
 from app.models.collection import Collection
 from app.models.item import Item
 from app.models.room import Room
+from app.models.session import Session as UserSession
 from app.models.stack import Stack
+from app.models.tag import ItemTagLink, Tag
 from app.models.user import User
 
 
@@ -24,7 +28,16 @@ def client() -> Generator[TestClient]:
 
 
 def clear_db(session: Session) -> None:
-    # Delete it all now that the tests are done
+    # Delete it all now that the tests are done, rows before the rows they reference
+    statement = delete(Attachment)
+    session.exec(statement)  # type: ignore
+
+    statement = delete(ItemTagLink)
+    session.exec(statement)  # type: ignore
+
+    statement = delete(Tag)
+    session.exec(statement)  # type: ignore
+
     statement = delete(Item)
     session.exec(statement)  # type: ignore
 
@@ -37,7 +50,7 @@ def clear_db(session: Session) -> None:
     statement = delete(Room)
     session.exec(statement)  # type: ignore
 
-    statement = delete(Attachment)
+    statement = delete(UserSession)
     session.exec(statement)  # type: ignore
 
     statement = delete(User)
@@ -72,3 +85,19 @@ def override_get_current_user() -> User:
 
 
 app.dependency_overrides[get_current_user] = override_get_current_user
+
+
+# Attachments are stored in memory rather than in a bucket
+memory_store = MemoryStore()
+
+
+@pytest.fixture
+def object_store() -> MemoryStore:
+    return memory_store
+
+
+def override_get_object_store() -> MemoryStore:
+    return memory_store
+
+
+app.dependency_overrides[get_object_store] = override_get_object_store
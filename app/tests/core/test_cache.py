@@ -0,0 +1,74 @@
+import pytest
+
+from app.core.cache import TTLCache
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr("app.core.cache.time.monotonic", clock)
+    return clock
+
+
+def test_get_missing() -> None:
+    ttl_cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=10)
+    assert ttl_cache.get("a") is None
+
+
+def test_expiry(clock: Clock) -> None:
+    ttl_cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=10)
+    ttl_cache.set("a", 1)
+    clock.now += 10
+    assert ttl_cache.get("a") == 1
+    clock.now += 0.1
+    assert ttl_cache.get("a") is None
+
+
+def test_expiry_override(clock: Clock) -> None:
+    ttl_cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=10)
+    ttl_cache.set("a", 1, ttl=1)
+    ttl_cache.set("b", 2, ttl=60)
+    clock.now += 30
+    assert ttl_cache.get("a") is None
+    assert ttl_cache.get("b") == 2
+
+
+def test_set_resets_expiry(clock: Clock) -> None:
+    ttl_cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=10)
+    ttl_cache.set("a", 1)
+    clock.now += 8
+    ttl_cache.set("a", 2)
+    clock.now += 8
+    assert ttl_cache.get("a") == 2
+
+
+def test_lru_eviction() -> None:
+    ttl_cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=10)
+    ttl_cache.set("a", 1)
+    ttl_cache.set("b", 2)
+    # Reading "a" makes "b" the least recently used
+    assert ttl_cache.get("a") == 1
+    ttl_cache.set("c", 3)
+    assert ttl_cache.get("b") is None
+    assert ttl_cache.get("a") == 1
+    assert ttl_cache.get("c") == 3
+
+
+def test_pop_and_clear() -> None:
+    ttl_cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=10)
+    ttl_cache.set("a", 1)
+    ttl_cache.set("b", 2)
+    ttl_cache.pop("a")
+    ttl_cache.pop("missing")
+    assert ttl_cache.get("a") is None
+    assert ttl_cache.get("b") == 2
+    ttl_cache.clear()
+    assert ttl_cache.get("b") is None
@@ -0,0 +1,84 @@
+from collections.abc import Generator
+from contextlib import contextmanager
+from typing import Any
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.core.db import async_engine
+from app.frontend.deps import session_cache, user_cache
+from app.tests.utils.session import create_user_session
+from app.tests.utils.user import create_random_user
+
+
+@contextmanager
+def record_queries() -> Generator[list[str]]:
+    queries: list[str] = []
+
+    def count_query(*args: Any) -> None:
+        queries.append(args[2])
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count_query)
+    try:
+        yield queries
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count_query)
+
+
+def test_get_session_queries(client: TestClient, db: Session) -> None:
+    user = create_random_user(db)
+    # The user has other sessions, which must not be loaded with it
+    create_user_session(db, user)
+    user_session = create_user_session(db, user)
+    session_cache.clear()
+    user_cache.clear()
+
+    with record_queries() as queries:
+        response = client.get("/items", headers={"Cookie": f"session_token={user_session.token}"})
+    assert response.status_code == 200
+    # The session joined with its user, nothing else
+    assert len(queries) == 1
+
+
+def test_session_and_user_cached(client: TestClient, db: Session) -> None:
+    user = create_random_user(db)
+    user_session = create_user_session(db, user)
+    session_cache.clear()
+    user_cache.clear()
+    headers = {"Cookie": f"session_token={user_session.token}"}
+
+    response = client.get("/items", headers=headers)
+    assert response.status_code == 200
+    cached_session = session_cache.get(user_session.token)
+    assert cached_session is not None
+    assert cached_session.user_id == user.id
+    cached_user = user_cache.get(user.id)  # type: ignore[arg-type]
+    assert cached_user is not None
+    assert cached_user.email == user.email
+
+    # Both come from the caches, without querying the database
+    with record_queries() as queries:
+        response = client.get("/items", headers=headers)
+    assert response.status_code == 200
+    assert len(queries) == 0
+
+
+def test_logout_invalidates_session_cache(client: TestClient, db: Session) -> None:
+    user = create_random_user(db)
+    user_session = create_user_session(db, user)
+    session_cache.clear()
+    headers = {"Cookie": f"session_token={user_session.token}"}
+
+    response = client.get("/items", headers=headers)
+    assert response.status_code == 200
+    assert session_cache.get(user_session.token) is not None
+
+    response = client.get("/logout", headers=headers, follow_redirects=False)
+    assert response.status_code == 307
+    assert session_cache.get(user_session.token) is None
+
+    # The logged out session isn't used again, even though it was cached
+    response = client.get("/items", headers=headers)
+    assert "Not authenticated" in response.text
+    assert session_cache.get(user_session.token) is None
@@ -0,0 +1,124 @@
+import asyncio
+import datetime
+from http.cookies import SimpleCookie
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from httpx import Response
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.db import db_url
+from app.core.deps import oidc_provider
+from app.frontend.main import get_session_from_state
+from app.models.session import Session as UserSession
+from app.tests.utils.session import create_user_session
+from app.tests.utils.user import create_random_user
+
+
+@pytest.fixture
+def provider_metadata(monkeypatch: pytest.MonkeyPatch) -> None:
+    metadata = SimpleNamespace(
+        authorization_endpoint="https://auth.example.com/authorize",
+        response_types_supported=["code"],
+        response_modes_supported=["form_post"],
+        grant_types_supported=["authorization_code"],
+        subject_types_supported=["public"],
+        token_endpoint_auth_methods_supported=["client_secret_post"],
+    )
+
+    async def get_metadata() -> SimpleNamespace:
+        return metadata
+
+    monkeypatch.setattr(oidc_provider, "get_metadata", get_metadata)
+
+
+def session_cookie(response: Response) -> dict[str, str | bool]:
+    cookie: SimpleCookie = SimpleCookie()
+    for set_cookie in response.headers.get_list("set-cookie"):
+        cookie.load(set_cookie)
+    morsel = cookie["session_token"]
+    return {"value": morsel.value, **{key: value for key, value in morsel.items() if value}}
+
+
+@pytest.mark.usefixtures("provider_metadata")
+def test_login_cookie(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings.frontend.cookie, "secure", True)
+    response = client.get("/login", follow_redirects=False)
+    assert response.status_code == 307
+    assert response.headers["location"].startswith("https://auth.example.com/authorize?")
+
+    cookie = session_cookie(response)
+    assert cookie["value"]
+    assert cookie["httponly"] is True
+    assert cookie["secure"] is True
+    assert cookie["samesite"] == "lax"
+    assert cookie["max-age"] == str(settings.frontend.cookie.max_age)
+
+
+def test_logout_cookie(client: TestClient, db: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings.frontend.cookie, "secure", True)
+    user_session = create_user_session(db, create_random_user(db))
+    response = client.get("/logout", headers={"Cookie": f"session_token={user_session.token}"}, follow_redirects=False)
+    assert response.status_code == 307
+
+    # Browsers only replace the cookie if the attributes match the ones it was set with
+    cookie = session_cookie(response)
+    assert cookie["value"] == ""
+    assert cookie["max-age"] == "0"
+    assert cookie["httponly"] is True
+    assert cookie["secure"] is True
+    assert cookie["samesite"] == "lax"
+
+
+def session_from_state(state: str) -> UserSession:
+    async def get() -> UserSession:
+        # A separate engine, the app's pool belongs to the test client's event loop
+        engine = create_async_engine(db_url, poolclass=NullPool)
+        try:
+            async with AsyncSession(engine) as session:
+                return await get_session_from_state(session, state)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(get())
+
+
+def test_session_from_state(db: Session) -> None:
+    user_session = create_user_session(db)
+    assert session_from_state(user_session.auth_state).token == user_session.token
+
+
+@pytest.mark.parametrize("state", ["", "unknown"])
+def test_session_from_state_unknown(state: str) -> None:
+    with pytest.raises(HTTPException) as exc_info:
+        session_from_state(state)
+    assert exc_info.value.status_code == 401
+    assert exc_info.value.detail == "Session is not active"
+
+
+def test_session_from_state_expired(db: Session) -> None:
+    user_session = create_user_session(db)
+    user_session.expires_at = datetime.datetime.now(tz=datetime.UTC) - datetime.timedelta(minutes=1)
+    db.add(user_session)
+    db.commit()
+
+    with pytest.raises(HTTPException) as exc_info:
+        session_from_state(user_session.auth_state)
+    assert exc_info.value.status_code == 401
+
+
+def test_session_from_state_logged_out(db: Session) -> None:
+    user_session = create_user_session(db)
+    user_session.logged_out_at = datetime.datetime.now(tz=datetime.UTC)
+    db.add(user_session)
+    db.commit()
+
+    with pytest.raises(HTTPException) as exc_info:
+        session_from_state(user_session.auth_state)
+    assert exc_info.value.status_code == 401
@@ -0,0 +1,23 @@
+import pytest
+
+from app.utils import etag_matches
+
+
+@pytest.mark.parametrize(
+    ("if_none_match", "etag", "expected"),
+    [
+        (None, 'W/"1-2"', False),
+        ("", 'W/"1-2"', False),
+        ('W/"1-2"', 'W/"1-2"', True),
+        # Weak comparison, a strong tag matches a weak one with the same value and vice versa
+        ('"1-2"', 'W/"1-2"', True),
+        ('W/"1-2"', '"1-2"', True),
+        ('W/"1-3"', 'W/"1-2"', False),
+        ("*", 'W/"1-2"', True),
+        (" * ", 'W/"1-2"', True),
+        ('W/"1-1", W/"1-2"', 'W/"1-2"', True),
+        ('W/"1-1",W/"1-3"', 'W/"1-2"', False),
+    ],
+)
+def test_etag_matches(if_none_match: str | None, etag: str, expected: bool) -> None:
+    assert etag_matches(if_none_match, etag) is expected
@@ -0,0 +1,18 @@
+from sqlmodel import Session
+
+from app.models.attachment import Attachment
+from app.models.item import Item
+from app.tests.utils.utils import random_lower_string
+
+
+def create_random_attachment(session: Session, item: Item) -> Attachment:
+    attachment = Attachment(
+        item_id=item.id,
+        filename=f"{random_lower_string()}.txt",
+        content_type="text/plain",
+        filesize=0,
+    )
+    session.add(attachment)
+    session.commit()
+    session.refresh(attachment)
+    return attachment
@@ -0,0 +1,17 @@
+import datetime
+
+from sqlmodel import Session
+
+from app.models.session import Session as UserSession
+from app.models.user import User
+
+
+def create_user_session(session: Session, user: User | None = None) -> UserSession:
+    user_session = UserSession(
+        expires_at=datetime.datetime.now(tz=datetime.UTC) + datetime.timedelta(hours=1),
+        user_id=user.id if user else None,
+    )
+    session.add(user_session)
+    session.commit()
+    session.refresh(user_session)
+    return user_session
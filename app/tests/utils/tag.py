@@ -0,0 +1,16 @@
+from sqlmodel import Session
+
+from app.models.tag import Tag
+from app.tests.utils.utils import random_lower_string
+
+
+def create_random_tag(session: Session) -> Tag:
+    name = random_lower_string()
+    tag = Tag(
+        name=name,
+        description=random_lower_string(),
+    )
+    session.add(tag)
+    session.commit()
+    session.refresh(tag)
+    return tag
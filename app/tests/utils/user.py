@@ -0,0 +1,16 @@
+from sqlmodel import Session
+
+from app.models.user import User
+from app.tests.utils.utils import random_email, random_lower_string
+
+
+def create_random_user(session: Session) -> User:
+    user = User(
+        email=random_email(),
+        name=random_lower_string(),
+        username=random_lower_string(),
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
@@ -1,3 +1,4 @@
+from functools import cache
 from typing import Literal
 from unicodedata import normalize
 from urllib.parse import quote
@@ -6,21 +7,38 @@ import humps
 from fastapi.routing import APIRoute
 
 
+@cache
+def pascalize(value: str) -> str:
+    # Most routes share a handful of tags, only convert each one once
+    return humps.pascalize(value)
+
+
 def generate_unique_route_id(route: APIRoute) -> str:
-    route_tag = humps.pascalize(str(route.tags[0]))
-    route_name = humps.pascalize(route.name)
+    route_tag = pascalize(str(route.tags[0]))
+    route_name = pascalize(route.name)
     return f"{route_tag}_{route_name}"
 
 
 def content_disposition_header(filename: str, type: Literal["attachment", "inline"] = "attachment") -> str:
     """Build an appropriate value for a Content-Disposition HTTP header"""
 
+    if filename.isascii():
+        # Nothing to normalize, the common case
+        return f'{type}; filename="{filename}"'
+
     # normalize the filename to ascii only characters
     ascii = normalize("NFKD", filename).encode("ascii", "ignore").decode("ascii")
     header = f'{type}; filename="{ascii}"'
 
-    # if the filename contained non-ascii characters, append the filename* parameter
-    if ascii != filename:
-        header += f"; filename*=UTF-8''{quote(filename)}"
+    # the filename contained non-ascii characters, append the filename* parameter
+    return f"{header}; filename*=UTF-8''{quote(filename)}"
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag, using the weak comparison"""
 
-    return header
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag.removeprefix("W/") for tag in if_none_match.split(","))